@@ -1,27 +1,78 @@
 import json
-from prettytable import PrettyTable
-import os
+import sys
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+try:
+    from sortedcontainers import SortedDict
+except ImportError:  # sortedcontainers is optional, rooms are sorted on demand without it
+    SortedDict = None
+
+# Below this many procedures the JIT call overhead is not worth it
+JIT_SUM_THRESHOLD = 10_000
+
+# Compiled _sum_costs: None until first needed, False when numba is not installed
+_sum_costs_jit = None
+
+
+def _sum_costs(costs):
+    total = 0.0
+    for i in range(costs.shape[0]):
+        total += costs[i]
+    return total
+
+
+def _jit_sum_costs():
+    """Compile _sum_costs on first use; numba is only imported here, not at startup."""
+    global _sum_costs_jit
+    if _sum_costs_jit is None:
+        try:
+            from numba import njit
+        except ImportError:  # numba is optional, costs are summed in pure Python without it
+            _sum_costs_jit = False
+        else:
+            _sum_costs_jit = njit(cache=True)(_sum_costs)
+    return _sum_costs_jit
+
+
+def total_cost(procedures):
+    """Sum the costs of a procedures dict, using the JIT kernel for large bills."""
+    costs = procedures.values()
+    if len(costs) >= JIT_SUM_THRESHOLD:
+        kernel = _jit_sum_costs()
+        if kernel:
+            import numpy as np
+            return kernel(np.fromiter(costs, dtype=np.float64, count=len(costs)))
+    return sum(costs)
 
 # --------------------------- DataHandler ---------------------------
 class DataHandler:
     """Handles loading and saving data from a JSON file."""
+    # 1 MiB write buffer so large data files go out in few syscalls
+    WRITE_BUFFER_SIZE = 1 << 20
+
     def __init__(self, file_path):
         self.file_path = file_path
 
     def load_data(self):
-        # Check if file exists, if not create default structure
-        if not os.path.exists(self.file_path):
+        try:
+            with open(self.file_path, "rb") as f:
+                raw = f.read()
+            if orjson is not None:
+                return orjson.loads(raw)
+            return json.loads(raw)
+        except FileNotFoundError:
+            # First run: create the default structure
             default_data = {
                 "doctors": [],
                 "patients": []
             }
             self.save_data(default_data)
             return default_data
-        
-        try:
-            with open(self.file_path, "r", encoding='utf-8') as f:
-                return json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        except json.JSONDecodeError:
             print(f"Error reading file {self.file_path}. Creating new file.")
             default_data = {
                 "doctors": [],
@@ -31,21 +82,41 @@ class DataHandler:
             return default_data
 
     def save_data(self, data):
-        with open(self.file_path, "w", encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Encode the whole document once and write it in a single call
+        if orjson is not None:
+            buf = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        else:
+            buf = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+        with open(self.file_path, "wb", buffering=self.WRITE_BUFFER_SIZE) as f:
+            f.write(buf)
 
 # --------------------------- Patient ---------------------------
 class Patient:
     """Represents a patient in the hospital."""
+    __slots__ = ("name", "age", "condition", "room_number", "_procedures")
+
     def __init__(self, name, age, condition, room_number=None, procedures=None):
         self.name = name
         self.age = age
         self.condition = condition
         self.room_number = room_number
-        self.procedures = procedures if procedures else {}
+        # The loaded dict is kept as is; an empty one is only created on first access
+        self._procedures = procedures if procedures else None
+
+    @property
+    def procedures(self):
+        if self._procedures is None:
+            self._procedures = {}
+        return self._procedures
+
+    @procedures.setter
+    def procedures(self, value):
+        self._procedures = value
 
 # --------------------------- Doctor ---------------------------
 class Doctor:
+    __slots__ = ("name", "age", "specialty")
+
     def __init__(self, name, age, specialty):
         self.name = name
         self.age = age
@@ -67,10 +138,13 @@ class EmergencyDept:
 class RoomManager:
     """Manages room assignments."""
     def __init__(self):
-        self.rooms = {}
+        self.rooms = SortedDict() if SortedDict is not None else {}
+        # Room number -> Patient, kept in sync with self.rooms for O(1) lookups
+        self._patients_by_room = {}
 
     def assign_room(self, patient, room_number):
-        if room_number in self.rooms:
+        # One probe both checks the room and claims it if free
+        if self._patients_by_room.setdefault(room_number, patient) is not patient:
             return False
         self.rooms[room_number] = patient.name
         patient.room_number = room_number
@@ -79,6 +153,16 @@ class RoomManager:
     def view_rooms(self):
         return self.rooms
 
+    def sorted_rooms(self):
+        """Return (room number, patient name) pairs ordered by room number."""
+        if SortedDict is not None:
+            return self.rooms.items()
+        return sorted(self.rooms.items())
+
+    def get_patient(self, room_number):
+        """Return the patient in the given room, or None if it is empty."""
+        return self._patients_by_room.get(room_number)
+
 # --------------------------- OperationManager ---------------------------
 class OperationManager:
     """Schedules operations for patients."""
@@ -96,12 +180,13 @@ class OperationManager:
 class BillingSystem:
     """Generates and displays billing information for patients."""
     def generate_bill(self, patient):
+        # prettytable is only imported once billing is actually used
+        from prettytable import PrettyTable
+        # A fresh table is cheaper than PrettyTable.copy(), which deep-copies every setting
         table = PrettyTable()
         table.field_names = ["Procedure", "Cost ($)"]
-        total = 0
-        for proc, cost in patient.procedures.items():
-            table.add_row([proc, f"{cost:.2f}"])
-            total += cost
+        total = total_cost(patient.procedures)
+        table.add_rows([[proc, f"{cost:.2f}"] for proc, cost in patient.procedures.items()])
         table.add_row(["Total", f"{total:.2f}"])
         return table
 
@@ -117,47 +202,66 @@ class HospitalSystem:
         self.billing = BillingSystem()
         
         # تعديل هنا لتجنب الخطأ
-        self.doctors = []
+        # Malformed records (not a dict or missing a key) are skipped
         doctors_data = self.data.get("doctors", [])
-        for d in doctors_data:
-            if isinstance(d, dict) and all(key in d for key in ['name', 'age', 'specialty']):
-                self.doctors.append(Doctor(d['name'], d['age'], d['specialty']))
+        self.doctors = [d for d in map(self._load_doctor, doctors_data) if d is not None]
         
-        self.patients = []
         patients_data = self.data.get("patients", [])
-        for p in patients_data:
-            if isinstance(p, dict) and all(key in p for key in ['name', 'age', 'condition']):
-                patient = Patient(
-                    p['name'], 
-                    p['age'], 
-                    p['condition'], 
-                    p.get('room_number'), 
-                    p.get('procedures', {})
-                )
-                self.patients.append(patient)
+        self.patients = [p for p in map(self._load_patient, patients_data) if p is not None]
                 
         # إضافة المرضى للغرف
         for p in self.patients:
             if p.room_number is not None:
                 self.room_manager.assign_room(p, p.room_number)
 
+        # JSON records already built for self.doctors / self.patients, by position
+        self._doctor_dicts = []
+        self._patient_dicts = []
+
+    @staticmethod
+    def _load_doctor(d):
+        """Build a Doctor from a JSON record, or return None if it is malformed"""
+        try:
+            return Doctor(d['name'], d['age'], d['specialty'])
+        except (KeyError, TypeError):
+            return None
+
+    @staticmethod
+    def _load_patient(p):
+        """Build a Patient from a JSON record, or return None if it is malformed"""
+        try:
+            return Patient(
+                p['name'], 
+                p['age'], 
+                p['condition'], 
+                p.get('room_number'), 
+                p.get('procedures', {})
+            )
+        except (KeyError, TypeError, AttributeError):
+            return None
+
     def save_current_state(self):
         """Save current state to file"""
+        # Doctors and patients are only ever appended, and a saved patient
+        # only changes through its procedures dict, which its record shares.
+        # So records from earlier saves stay valid and only new entries are built.
+        self._doctor_dicts.extend(
+            {"name": d.name, "age": d.age, "specialty": d.specialty} 
+            for d in self.doctors[len(self._doctor_dicts):]
+        )
+        self._patient_dicts.extend(
+            {
+                "name": p.name, 
+                "age": p.age, 
+                "condition": p.condition,
+                "room_number": p.room_number,
+                "procedures": p.procedures
+            } 
+            for p in self.patients[len(self._patient_dicts):]
+        )
         data = {
-            "doctors": [
-                {"name": d.name, "age": d.age, "specialty": d.specialty} 
-                for d in self.doctors
-            ],
-            "patients": [
-                {
-                    "name": p.name, 
-                    "age": p.age, 
-                    "condition": p.condition,
-                    "room_number": p.room_number,
-                    "procedures": p.procedures
-                } 
-                for p in self.patients
-            ]
+            "doctors": self._doctor_dicts,
+            "patients": self._patient_dicts
         }
         self.data_handler.save_data(data)
 
@@ -207,7 +311,7 @@ class HospitalSystem:
             print("Room number must be a number")
             return
             
-        patient = next((p for p in self.patients if p.room_number == room), None)
+        patient = self.room_manager.get_patient(room)
         if not patient:
             print("No patient in that room")
             return
@@ -233,7 +337,7 @@ class HospitalSystem:
             print("Room number must be a number")
             return
             
-        patient = next((p for p in self.patients if p.room_number == room), None)
+        patient = self.room_manager.get_patient(room)
         if not patient:
             print("No patient in that room")
             return
@@ -252,7 +356,53 @@ class HospitalSystem:
         print("\n--- Patient Bill ---")
         print(self.billing.generate_bill(patient))
 
+    def show_emergency(self):
+        print("\n--- Emergency Department ---")
+        emergency_patients = self.emergency.list_patients()
+        if emergency_patients:
+            lines = [
+                f"Name: {p.name}, Age: {p.age}, Condition: {p.condition}, "
+                + (f"Room: {p.room_number}" if p.room_number else "No room assigned")
+                for p in emergency_patients
+            ]
+            sys.stdout.write("\n".join(lines) + "\n")
+        else:
+            print("No patients in emergency department")
+
+    def show_rooms(self):
+        print("\n--- Room Status ---")
+        rooms = self.room_manager.view_rooms()
+        if rooms:
+            sys.stdout.write("".join(f"Room {room}: {name}\n" for room, name in rooms.items()))
+        else:
+            print("All rooms are empty")
+
+    def save_from_menu(self):
+        self.save_current_state()
+        print("Data saved successfully")
+
+    def exit_menu(self):
+        """Ask whether to save, then return True to leave the main menu"""
+        print("Do you want to save data before exiting? (yes/no): ", end="")
+        save_choice = input()
+        if save_choice.lower() in ['yes', 'y']:
+            self.save_current_state()
+            print("Data saved")
+        print("Thank you for using Capital Hospital Management System")
+        return True
+
     def main_menu(self):
+        # Menu choice -> handler; a handler returning True ends the loop
+        dispatch = {
+            '1': self.show_emergency,
+            '2': self.show_rooms,
+            '3': self.add_patient,
+            '4': self.add_doctor,
+            '5': self.schedule_operation,
+            '6': self.generate_bill,
+            '7': self.save_from_menu,
+            '8': self.exit_menu,
+        }
         while True:
             print("\n" + "="*50)
             print("         Capital Hospital - Patient Management System")
@@ -269,49 +419,8 @@ class HospitalSystem:
             
             choice = input("Select option (1-8): ")
             
-            if choice == '1':
-                print("\n--- Emergency Department ---")
-                emergency_patients = self.emergency.list_patients()
-                if emergency_patients:
-                    for p in emergency_patients:
-                        room_status = f"Room: {p.room_number}" if p.room_number else "No room assigned"
-                        print(f"Name: {p.name}, Age: {p.age}, Condition: {p.condition}, {room_status}")
-                else:
-                    print("No patients in emergency department")
-                    
-            elif choice == '2':
-                print("\n--- Room Status ---")
-                rooms = self.room_manager.view_rooms()
-                if rooms:
-                    for room, name in rooms.items():
-                        print(f"Room {room}: {name}")
-                else:
-                    print("All rooms are empty")
-                    
-            elif choice == '3':
-                self.add_patient()
-                
-            elif choice == '4':
-                self.add_doctor()
-                
-            elif choice == '5':
-                self.schedule_operation()
-                
-            elif choice == '6':
-                self.generate_bill()
-                
-            elif choice == '7':
-                self.save_current_state()
-                print("Data saved successfully")
-                
-            elif choice == '8':
-                print("Do you want to save data before exiting? (yes/no): ", end="")
-                save_choice = input()
-                if save_choice.lower() in ['yes', 'y']:
-                    self.save_current_state()
-                    print("Data saved")
-                print("Thank you for using Capital Hospital Management System")
+            handler = dispatch.get(choice)
+            if handler is None:
+                print("Invalid choice. Please try again")
+            elif handler():
                 break
-                
-            else:
-                print("Invalid choice. Please try again")
\ No newline at end of file
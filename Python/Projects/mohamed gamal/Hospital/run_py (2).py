@@ -7,7 +7,7 @@ This is the main script that runs the hospital management system.
 import os
 import sys
 import json
-from hospital_system_py import HospitalSystem
+from hospital_system_py import DataHandler, HospitalSystem, Patient, Doctor
 
 def main():
     """Main function to run the hospital management system"""
@@ -68,8 +68,7 @@ def create_initial_data(file_path, doctors_json=None, patients_json=None):
             print("Warning: Invalid patients JSON data")
     
     # Save initial data
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    DataHandler(file_path).save_data(data)
     
     print(f"Initial data created at {file_path}")
 
@@ -84,7 +83,6 @@ def run_batch_operations(system):
         room = os.environ.get('PATIENT_ROOM')
         
         # Add patient programmatically
-        from hospital_system_py import Patient
         patient = Patient(name, age, condition)
         system.patients.append(patient)
         system.emergency.add_patient(patient)
@@ -100,7 +98,6 @@ def run_batch_operations(system):
         specialty = os.environ.get('DOCTOR_SPECIALTY', 'General Practice')
         
         # Add doctor programmatically
-        from hospital_system_py import Doctor
         doctor = Doctor(name, age, specialty)
         system.doctors.append(doctor)
         
@@ -117,62 +114,72 @@ def generate_hospital_report(system):
     output_dir = os.environ.get('OUTPUT_DIR', 'output')
     report_file = os.path.join(output_dir, 'hospital_report.txt')
     
+    # Collect the report in memory and write it out in one call
+    parts = []
+    parts.append("="*60 + "\n")
+    parts.append("           CAPITAL HOSPITAL - SYSTEM REPORT\n")
+    parts.append("="*60 + "\n\n")
+    
+    # Doctors section
+    parts.append("DOCTORS:\n")
+    parts.append("-"*40 + "\n")
+    if system.doctors:
+        parts.extend(
+            f"{i}. {doctor.name} (Age: {doctor.age}, Specialty: {doctor.specialty})\n"
+            for i, doctor in enumerate(system.doctors, 1)
+        )
+    else:
+        parts.append("No doctors in the system\n")
+    parts.append("\n")
+    
+    # Patients section
+    parts.append("PATIENTS:\n")
+    parts.append("-"*40 + "\n")
+    if system.patients:
+        for i, patient in enumerate(system.patients, 1):
+            room_info = f"Room {patient.room_number}" if patient.room_number else "No room assigned"
+            parts.append(f"{i}. {patient.name} (Age: {patient.age}, Condition: {patient.condition}, {room_info})\n")
+    else:
+        parts.append("No patients in the system\n")
+    parts.append("\n")
+    
+    # Emergency patients
+    parts.append("EMERGENCY PATIENTS:\n")
+    parts.append("-"*40 + "\n")
+    emergency_patients = system.emergency.list_patients()
+    if emergency_patients:
+        parts.extend(
+            f"{i}. {patient.name} - {patient.condition}\n"
+            for i, patient in enumerate(emergency_patients, 1)
+        )
+    else:
+        parts.append("No emergency patients\n")
+    parts.append("\n")
+    
+    # Room occupancy
+    parts.append("ROOM OCCUPANCY:\n")
+    parts.append("-"*40 + "\n")
+    rooms = system.room_manager.view_rooms()
+    if rooms:
+        parts.extend(
+            f"Room {room_num}: {patient_name}\n"
+            for room_num, patient_name in system.room_manager.sorted_rooms()
+        )
+    else:
+        parts.append("All rooms are empty\n")
+    parts.append("\n")
+    
+    # Statistics
+    parts.append("STATISTICS:\n")
+    parts.append("-"*40 + "\n")
+    parts.append(f"Total Doctors: {len(system.doctors)}\n")
+    parts.append(f"Total Patients: {len(system.patients)}\n")
+    parts.append(f"Emergency Patients: {len(emergency_patients)}\n")
+    parts.append(f"Occupied Rooms: {len(rooms)}\n")
+    parts.append(f"Scheduled Operations: {len(system.operations.operations)}\n")
+    
     with open(report_file, 'w', encoding='utf-8') as f:
-        f.write("="*60 + "\n")
-        f.write("           CAPITAL HOSPITAL - SYSTEM REPORT\n")
-        f.write("="*60 + "\n\n")
-        
-        # Doctors section
-        f.write("DOCTORS:\n")
-        f.write("-"*40 + "\n")
-        if system.doctors:
-            for i, doctor in enumerate(system.doctors, 1):
-                f.write(f"{i}. {doctor.name} (Age: {doctor.age}, Specialty: {doctor.specialty})\n")
-        else:
-            f.write("No doctors in the system\n")
-        f.write("\n")
-        
-        # Patients section
-        f.write("PATIENTS:\n")
-        f.write("-"*40 + "\n")
-        if system.patients:
-            for i, patient in enumerate(system.patients, 1):
-                room_info = f"Room {patient.room_number}" if patient.room_number else "No room assigned"
-                f.write(f"{i}. {patient.name} (Age: {patient.age}, Condition: {patient.condition}, {room_info})\n")
-        else:
-            f.write("No patients in the system\n")
-        f.write("\n")
-        
-        # Emergency patients
-        f.write("EMERGENCY PATIENTS:\n")
-        f.write("-"*40 + "\n")
-        emergency_patients = system.emergency.list_patients()
-        if emergency_patients:
-            for i, patient in enumerate(emergency_patients, 1):
-                f.write(f"{i}. {patient.name} - {patient.condition}\n")
-        else:
-            f.write("No emergency patients\n")
-        f.write("\n")
-        
-        # Room occupancy
-        f.write("ROOM OCCUPANCY:\n")
-        f.write("-"*40 + "\n")
-        rooms = system.room_manager.view_rooms()
-        if rooms:
-            for room_num, patient_name in sorted(rooms.items()):
-                f.write(f"Room {room_num}: {patient_name}\n")
-        else:
-            f.write("All rooms are empty\n")
-        f.write("\n")
-        
-        # Statistics
-        f.write("STATISTICS:\n")
-        f.write("-"*40 + "\n")
-        f.write(f"Total Doctors: {len(system.doctors)}\n")
-        f.write(f"Total Patients: {len(system.patients)}\n")
-        f.write(f"Emergency Patients: {len(emergency_patients)}\n")
-        f.write(f"Occupied Rooms: {len(rooms)}\n")
-        f.write(f"Scheduled Operations: {len(system.operations.operations)}\n")
+        f.write("".join(parts))
     
     print(f"Hospital report generated: {report_file}")
 
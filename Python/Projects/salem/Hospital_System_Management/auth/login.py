@@ -1,3 +1,7 @@
+import hmac
+from functools import cached_property
+
+
 class Login:
     def __init__(self, username: str, password: str):
         self.username = username
@@ -6,18 +10,28 @@ class Login:
     def authenticate(self) -> bool:
         # Placeholder for authentication logic
         # In a real application, this would check the credentials against a database
-        return self.username == "admin" and self.password == "admin"
+        # compare_digest takes the same time whether or not the values match, and `&`
+        # avoids short-circuiting so a wrong username is not faster than a wrong password
+        username_ok = hmac.compare_digest(self.username.encode('utf-8'), b"admin")
+        password_ok = hmac.compare_digest(self.password.encode('utf-8'), b"admin")
+        return username_ok & password_ok
     
-    def get_user_info(self) -> dict:
+    @cached_property
+    def user_info(self) -> dict:
         # Placeholder for user information retrieval
         # In a real application, this would fetch user details from a database
+        # Built once per Login instance and reused on later calls
         return {
             "username": self.username,
             "role": "admin" if self.username == "admin" else "user"
         }
+
+    def get_user_info(self) -> dict:
+        return self.user_info
+
     def login(self) -> str:
         if self.authenticate():
-            user_info = self.get_user_info()
+            user_info = self.user_info
             return f"Login successful! Welcome {user_info['username']} ({user_info['role']})"
         else:
             return "Login failed! Invalid username or password."
@@ -1,48 +1,371 @@
+import atexit
+import csv
 import json
+import os
 import random
+import sys
 from model import Patient, Billing, Department, Staff
 from model.staff import Doctor, Nurse
+from core.storage import SQLiteStore, SQLITE_EXTENSIONS
 from prettytable import PrettyTable
 import datetime
+from collections.abc import MutableMapping
+from operator import attrgetter
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the stdlib json module
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, only needed for MessagePack database files
+    msgpack = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional, JSON database files are parsed in one go without it
+    ijson = None
+
+# Database files with these extensions are stored as MessagePack instead of JSON
+MSGPACK_EXTENSIONS = ('.msgpack', '.mpk')
+
+# Statuses accepted by update_patient_status
+_VALID_STATUS = frozenset({'normal', 'surgery', 'emergency', 'death'})
+
+# Positions that have their own section in view_department_staff
+_ROLE_SET = frozenset({'doctor', 'nurse'})
+
+# Accepted answers to yes/no prompts, after lowercasing
+_YES_ANSWERS = frozenset({'y', 'yes'})
+_NO_ANSWERS = frozenset({'n', 'no'})
+
+# Without orjson, databases with more patients than this are encoded piecewise on save
+STREAM_SAVE_PATIENTS = 10_000
+
+# Fields the edit menus can change, read together to tell whether an edit changed anything
+_PATIENT_EDIT_FIELDS = attrgetter(
+    'name', 'age', 'phone_number', 'date_of_birth', 'gender', 'email', 'address', 'identifier', 'condition',
+    'status', 'patient_next_of_kin', 'date_of_death', 'register_date', 'discharge_date', 'insurance')
+_STAFF_EDIT_FIELDS = attrgetter(
+    'name', 'age', 'position', 'phone_number', 'date_of_birth', 'gender', 'email', 'address', 'identifier')
+
+# Tables longer than this are formatted directly instead of through PrettyTable
+PLAIN_TABLE_ROWS = 100
+
+# Column headers of the bill and procedure tables
+_BILL_FIELDS = ("Description", "Amount", "Paid")
+_INDEXED_BILL_FIELDS = ("Index", "Description", "Amount", "Paid")
+_PROCEDURE_FIELDS = ("Date", "Description")
+
+# One PrettyTable per header tuple, emptied and refilled on each use
+_TABLES = {}
+
+# Errors raised while decoding a damaged database file
+DECODE_ERRORS = (ValueError, ijson.JSONError) if ijson is not None else (ValueError,)
+
+# Main menu, built once; main_menu writes it with a single call per loop
+_MENU_TEXT = "\n".join([
+    "\n" + "=" * 50,
+    "Capital Hospital - Patient Management System",
+    "=" * 50,
+    "1. View Patients",
+    "2. View Rooms",
+    "3. Add Patient",
+    "4. Assign Room",
+    "5. Generate Bill",
+    "6. View Patient Bills",
+    "7. Mark Bill as Paid",
+    "8. Add Department",
+    "9. Add Staff to Department",
+    "10. View Department Staff",
+    "11. Edit Patient",
+    "12. Remove Patient",
+    "13. Edit Staff in Department",
+    "14. Remove Staff from Department",
+    "15. Update Patient Status",
+    "16. Add Procedure to Patient",
+    "17. View Patient Procedures",
+    "18. Generate Bills from Procedures",
+    "19. Save Data",
+    "20. Exit",
+    "21. Assign Patient to Doctor",
+    "22. View Doctor's Patients",
+    "23. Add Staff to Department from a CSV Line",
+    "-" * 50,
+    "",
+])
+
+
+def _default(obj):
+    """
+    Encoder fallback for model objects, so lists of patients can be serialized
+    without first building a list of their dictionaries.
+    Args:
+        obj: An object the encoder does not handle natively.
+    Returns:
+        dict: The object's to_dict() result.
+    """
+    to_dict = getattr(obj, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+    return to_dict()
+
+
+def _dumps(data, indent=False):
+    """
+    Serialize data to JSON bytes.
+    Args:
+        data: The object to serialize.
+        indent (bool): Pretty-print with two-space indentation instead of the compact form.
+    Returns:
+        bytes: The encoded document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, default=_default, indent=2).encode('utf-8')
+    return json.dumps(data, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def _loads(raw):
+    """
+    Parse JSON bytes.
+    Args:
+        raw (bytes): The encoded document.
+    Returns:
+        The decoded object.
+    """
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def _encode_snapshot(data, path, pretty=False):
+    """
+    Encode the full database for writing to path, as MessagePack or compact JSON
+    depending on the file extension.
+    Args:
+        data (dict): The database contents.
+        path (str): The database file path.
+        pretty (bool): Indent JSON output; ignored for MessagePack.
+    Returns:
+        bytes: The encoded database.
+    """
+    if path.endswith(MSGPACK_EXTENSIONS):
+        if msgpack is None:
+            raise ImportError(f"msgpack is required to write '{path}'")
+        return msgpack.packb(data, default=_default, use_bin_type=True)
+    return _dumps(data, indent=pretty)
+
+
+def _print_table(field_names, rows):
+    """
+    Print rows as a bordered table.
+    Short tables go through PrettyTable; long ones are formatted here in one
+    pass with precomputed column widths and written with a single call.
+    Args:
+        field_names (tuple): Column headers.
+        rows (list): One list of cell values per row.
+    """
+    if len(rows) <= PLAIN_TABLE_ROWS:
+        table = _TABLES.get(field_names)
+        if table is None:
+            table = _TABLES[field_names] = PrettyTable()
+            table.field_names = field_names
+        else:
+            table.clear_rows()
+        table.add_rows(rows)
+        print(table)
+        return
+    cells = [[str(v) for v in row] for row in rows]
+    widths = [len(name) for name in field_names]
+    for row in cells:
+        for i, v in enumerate(row):
+            if len(v) > widths[i]:
+                widths[i] = len(v)
+    border = "+" + "+".join("-" * (w + 2) for w in widths) + "+"
+    fmt = "| " + " | ".join(f"{{:<{w}}}" for w in widths) + " |"
+    lines = [border, fmt.format(*field_names), border]
+    lines.extend(fmt.format(*row) for row in cells)
+    lines.append(border)
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _decode_snapshot(raw):
+    """
+    Decode a database file, detecting legacy JSON files by their leading '{'.
+    Args:
+        raw (bytes): The file contents.
+    Returns:
+        dict: The database contents.
+    """
+    if not raw.strip() or raw.lstrip()[:1] == b'{':
+        return _loads(raw)
+    if msgpack is None:
+        raise ImportError("msgpack is required to read a MessagePack database file")
+    return msgpack.unpackb(raw, raw=False)
+
+
+class _LazyDepartments(MutableMapping):
+    """
+    Mapping of department names to Department objects that builds each
+    Department from its stored record only when it is first looked up.
+    Departments that are never opened are saved back from their raw record.
+    """
+
+    def __init__(self):
+        self._raw = {}
+        self._loaded = {}
+
+    def set_raw(self, name, record):
+        """
+        Store a department record without building the Department yet.
+        Args:
+            name (str): Name of the department.
+            record (dict): The department as produced by Department.to_dict().
+        """
+        self._loaded.pop(name, None)
+        self._raw[name] = record
+
+    def record(self, name):
+        """
+        Args:
+            name (str): Name of the department.
+        Returns:
+            dict: The department's record, without building the Department if it was never used.
+        """
+        return self._loaded[name].to_dict() if name in self._loaded else self._raw[name]
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Every department's record, keyed by name.
+        """
+        return {name: self.record(name) for name in self}
+
+    def __getitem__(self, name):
+        dept = self._loaded.get(name)
+        if dept is None:
+            dept = self._loaded[name] = Department.from_dict(name, self._raw[name])
+        return dept
+
+    def __setitem__(self, name, dept):
+        self._raw.setdefault(name, None)
+        self._loaded[name] = dept
+
+    def __delitem__(self, name):
+        del self._raw[name]
+        self._loaded.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._raw
+
+    def __iter__(self):
+        return iter(self._raw)
+
+    def __len__(self):
+        return len(self._raw)
 
 """
 Main class for managing the hospital system, including patients, rooms, departments, and staff.
 Attributes:
     patients (list): List of Patient objects in the hospital.
     rooms (dict): Mapping of room numbers to patient names.
-    departments (dict): Mapping of department names to Department objects.
+    departments (_LazyDepartments): Mapping of department names to Department objects.
     db_file (str): Path to the database file for saving/loading data.
+    journal_file (str): Path to the append-only log of changes made since the last full save.
 """
 
 class HospitalSystem:
+    # Journal size in bytes above which it is folded back into the database file
+    JOURNAL_LIMIT = 1 << 20
+    # Keep parsed database files in memory so later instances on an unchanged
+    # file skip parsing (useful for tests and tools that build many instances).
+    # Off by default: it holds a full parsed copy next to the live objects.
+    CACHE_SNAPSHOTS = False
+    # Absolute path -> ((st_mtime_ns, st_size), parsed records)
+    _snapshot_cache = {}
+
     def __init__(self, db_file="hospital_database.json"):
         self.patients = []
         self.rooms = {}
-        self.departments = {}
+        self.departments = _LazyDepartments()
         self.db_file = db_file
+        self.journal_file = db_file + ".log"
+        self._journal = None
+        # True while the journal holds changes not yet folded into the database file
+        self._dirty = False
+        # Sequence number of the last journal record applied; saved with the database file so
+        # replay skips records it already contains (a crash can leave the journal behind a save)
+        self._seq = 0
+        # SQLite database files are saved row by row: only records changed since the last save are written
+        self._store = SQLiteStore(db_file) if db_file.endswith(SQLITE_EXTENSIONS) else None
+        self._changed_patients = set()
+        self._removed_patients = set()
+        self._changed_departments = set()
+        # Patient lookup indexes, kept in sync with self.patients
+        self._by_name = {}
+        self._by_number = {}
+        self._by_identifier = {}
+        # Menu option -> handler; a handler returning True ends the loop
+        self._menu = {
+            '1': self._opt_view_patients,
+            '2': self._opt_view_rooms,
+            '3': self._opt_add_patient,
+            '4': self._opt_assign_room,
+            '5': self._opt_generate_bill,
+            '6': self._opt_view_bills,
+            '7': self._opt_mark_bill_paid,
+            '8': self._opt_add_department,
+            '9': self._opt_add_staff,
+            '10': self._opt_view_department_staff,
+            '11': self._opt_edit_patient,
+            '12': self._opt_remove_patient,
+            '13': self._opt_edit_staff,
+            '14': self._opt_remove_staff,
+            '15': self._opt_update_status,
+            '16': self._opt_add_procedure,
+            '17': self._opt_view_procedures,
+            '18': self._opt_bill_procedures,
+            '19': self._opt_save,
+            '20': self._opt_exit,
+            '21': self._opt_assign_doctor,
+            '22': self._opt_view_doctor_patients,
+            '23': self._opt_add_staff_csv,
+        }
         self.load_data()
+        atexit.register(self._flush_if_dirty)
+
+    def _index_patient(self, patient):
+        """
+        Add a patient to the lookup indexes.
+        When several patients share a name or identifier, the first one added is kept,
+        matching the order of self.patients.
+        Args:
+            patient (Patient): The patient to index.
+        """
+        self._by_name.setdefault(patient.name, patient)
+        self._by_number.setdefault(str(patient.patient_number), patient)
+        self._by_identifier.setdefault(patient.identifier, patient)
+
+    def _rebuild_indexes(self):
+        """
+        Rebuild the patient lookup indexes from self.patients.
+        """
+        self._by_name = {}
+        self._by_number = {}
+        self._by_identifier = {}
+        for p in self.patients:
+            self._index_patient(p)
 
     def generate_patient_number(self):
         """
-        Generate a unique patient number based on existing patients and database records.
+        Generate a unique patient number, one above the highest number handed out so far.
         Returns:
-            str: The next available patient number as a string.
+            int: The next available patient number.
         """
-        numbers = set()
-        numbers.update(int(p.patient_number) for p in self.patients if str(p.patient_number).isdigit())
-        try:
-            with open(self.db_file, "r") as f:
-                data = json.load(f)
-                for p in data.get('patients', []):
-                    num = p.get('patient_number')
-                    if num and str(num).isdigit():
-                        numbers.add(int(num))
-        except Exception:
-            pass
-        if numbers:
-            return str(max(numbers) + 1)
-        else:
-            return '1001'
+        number = self._next_patient_number
+        self._next_patient_number += 1
+        return number
 
     def add_patient(self, name, age, condition, phone_number, date_of_birth, gender, email, address, identifier, patient_next_of_kin, room_number=None, insurance=None):
         """
@@ -64,22 +387,21 @@ class HospitalSystem:
             Patient or None: The created Patient object, or None if duplicate found.
         """
         # Prevent duplicate by identifier or patient_number
-        for p in self.patients:
-            if p.identifier == identifier:
-                print(f"Patient with identifier '{identifier}' already exists.")
-                return None
+        if identifier in self._by_identifier:
+            print(f"Patient with identifier '{identifier}' already exists.")
+            return None
         patient_number = self.generate_patient_number()
-        for p in self.patients:
-            if str(p.patient_number) == str(patient_number):
-                print(f"Patient number '{patient_number}' already exists.")
-                return None
+        if str(patient_number) in self._by_number:
+            print(f"Patient number '{patient_number}' already exists.")
+            return None
         register_date = datetime.datetime.now().strftime('%Y-%m-%d')
         patient = Patient(name, age, condition, patient_number, phone_number, date_of_birth, gender, email, address, identifier, patient_next_of_kin, room_number=room_number, register_date=register_date, insurance=insurance)
         self.patients.append(patient)
+        self._index_patient(patient)
         if room_number:
             self.rooms[room_number] = name
         print(f"Patient '{name}' added with number {patient_number}.")
-        self.save_data()
+        self._log_patient(patient)
         return patient
 
     def assign_room(self, patient, room_number):
@@ -92,7 +414,7 @@ class HospitalSystem:
         patient.room_number = room_number
         self.rooms[room_number] = patient.name
         print(f"Assigned room {room_number} to {patient.name}.")
-        self.save_data()
+        self._log_patient(patient)
 
     def generate_bill(self, patient, amount, description):
         """
@@ -102,17 +424,17 @@ class HospitalSystem:
             amount (float): The amount to bill.
             description (str): Description of the bill.
         """
-        insurance_coverage = 0
-        if hasattr(patient, 'insurance') and patient.insurance.get('coverage_percent', 0) > 0:
+        if patient.coverage_fraction:
             insurance_coverage = patient.insurance['coverage_percent']
-            discounted_amount = Billing(amount, description).get_discounted_amount(insurance_coverage)
+            # Same arithmetic as Billing.get_discounted_amount, without a throwaway Billing
+            discounted_amount = amount - patient.coverage_fraction * amount
             bill = Billing(discounted_amount, f"{description} (after {insurance_coverage}% insurance discount)")
             print(f"Bill generated for {patient.name}: {amount} - {description}\nInsurance applied: {insurance_coverage}%\nAmount after insurance: {discounted_amount}")
         else:
             bill = Billing(amount, description)
             print(f"Bill generated for {patient.name}: {amount} - {description}")
         patient.add_bill(bill)
-        self.save_data()
+        self._log('add_bill', patient_number=patient.patient_number, bill=bill.to_dict())
 
     def view_bills(self, patient):
         """
@@ -120,11 +442,14 @@ class HospitalSystem:
         Args:
             patient (Patient): The patient whose bills to view.
         """
-        table = PrettyTable()
-        table.field_names = ["Description", "Amount", "Paid"]
-        for bill in patient.billing:
-            table.add_row([bill.description, bill.amount, "Yes" if bill.paid else "No"])
-        print(table)
+        billing = patient.billing
+        _print_table(_BILL_FIELDS, [
+            [description, amount, "Yes" if paid else "No"]
+            for description, amount, paid in zip(billing.descriptions, billing.amounts, billing.paid)
+        ])
+        if billing:
+            billed, paid = billing.totals()
+            print(f"Total billed: {billed}, Paid: {paid}, Outstanding: {billed - paid}")
 
     def add_department(self, name):
         """
@@ -135,7 +460,7 @@ class HospitalSystem:
         if name not in self.departments:
             self.departments[name] = Department(name)
             print(f"Department '{name}' added.")
-            self.save_data()
+            self._log_department(name)
         else:
             print(f"Department '{name}' already exists.")
 
@@ -158,16 +483,17 @@ class HospitalSystem:
         if dept_name not in self.departments:
             print(f"Department '{dept_name}' does not exist. Creating it.")
             self.add_department(dept_name)
-        if staff_position.lower() == 'doctor':
+        position = staff_position.lower()
+        if position == 'doctor':
             doctor = Doctor(staff_name, staff_age, staff_phone_number, staff_date_of_birth, staff_gender, staff_email, staff_address, staff_identifier, specialty or "General")
             self.departments[dept_name].add_doctor(doctor)
-        elif staff_position.lower() == 'nurse':
+        elif position == 'nurse':
             nurse = Nurse(staff_name, staff_age, staff_phone_number, staff_date_of_birth, staff_gender, staff_email, staff_address, staff_identifier, dept_name)
             self.departments[dept_name].add_nurse(nurse)
         else:
             staff = Staff(staff_name, staff_age, staff_phone_number, staff_date_of_birth, staff_gender, staff_email, staff_address, staff_identifier, staff_position)
             self.departments[dept_name].add_staff(staff)
-        self.save_data()
+        self._log_department(dept_name)
 
     def assign_patient_to_doctor_in_department(self, dept_name, doctor_name, patient):
         """
@@ -178,10 +504,10 @@ class HospitalSystem:
             patient (Patient): Patient object to assign.
         """
         if dept_name in self.departments:
-            doctor = next((d for d in self.departments[dept_name].doctors if d.name == doctor_name), None)
+            doctor = self.departments[dept_name].find_doctor(doctor_name)
             if doctor:
                 self.departments[dept_name].assign_patient_to_doctor(patient, doctor)
-                self.save_data()
+                self._log_department(dept_name)
             else:
                 print(f"Doctor '{doctor_name}' not found in department '{dept_name}'.")
         else:
@@ -195,23 +521,23 @@ class HospitalSystem:
         """
         if dept_name in self.departments:
             dept = self.departments[dept_name]
+            # Collect the whole listing and write it once
+            lines = []
             if dept.doctors:
-                print(f"Doctors in {dept_name}:")
-                for d in dept.doctors:
-                    print(d.view_info())
+                lines.append(f"Doctors in {dept_name}:")
+                lines.extend(d.view_info() for d in dept.doctors)
             else:
-                print(f"No doctors in department '{dept_name}'.")
+                lines.append(f"No doctors in department '{dept_name}'.")
             if dept.nurses:
-                print(f"Nurses in {dept_name}:")
-                for n in dept.nurses:
-                    print(n.view_info())
+                lines.append(f"Nurses in {dept_name}:")
+                lines.extend(n.view_info() for n in dept.nurses)
             else:
-                print(f"No nurses in department '{dept_name}'.")
-            other_staff = [s for s in dept.staff if s.position.lower() not in ['doctor', 'nurse']]
+                lines.append(f"No nurses in department '{dept_name}'.")
+            other_staff = [s for s in dept.staff if s.position_lc not in _ROLE_SET]
             if other_staff:
-                print(f"Other staff in {dept_name}:")
-                for s in other_staff:
-                    print(s.view_info())
+                lines.append(f"Other staff in {dept_name}:")
+                lines.extend(s.view_info() for s in other_staff)
+            sys.stdout.write("\n".join(lines) + "\n")
         else:
             print(f"Department '{dept_name}' does not exist.")
 
@@ -223,11 +549,12 @@ class HospitalSystem:
             doctor_name (str): Name of the doctor.
         """
         if dept_name in self.departments:
-            doctor = next((d for d in self.departments[dept_name].doctors if d.name == doctor_name), None)
+            doctor = self.departments[dept_name].find_doctor(doctor_name)
             if doctor:
-                if doctor.patients:
+                patients = doctor.view_patients()
+                if patients:
                     print(f"Patients of Dr. {doctor.name}:")
-                    for p in doctor.patients:
+                    for p in patients:
                         print(f"{p.name} (Number: {p.patient_number})")
                 else:
                     print(f"No patients assigned to Dr. {doctor.name}.")
@@ -244,53 +571,341 @@ class HospitalSystem:
         """
         return self.rooms
 
-    def save_data(self):
-        """
-        Save all hospital data (patients, departments, staff) to the database file.
-        """
-        data = {
-            'patients': [p.to_dict() for p in self.patients],
-            'departments': {
-                name: {
-                    'patients': [getattr(p, 'name', str(p)) for p in dept.patients],
-                    'staff': [
-                        {'name': s.name, 'age': s.age, 'position': s.position, 'phone_number': s.phone_number, 'date_of_birth': s.date_of_birth, 'gender': s.gender, 'email': s.email, 'address': s.address, 'identifier': s.identifier }
-                        for s in dept.staff
-                    ]
-                } for name, dept in self.departments.items()
-            }
+    def _log(self, op, **payload):
+        """
+        Append one change record to the journal file.
+        Args:
+            op (str): The kind of change: 'put_patient', 'remove_patient', 'put_department',
+                or one of the smaller per-patient records 'add_bill', 'mark_bill_paid' and 'add_procedure'.
+            payload: The data needed to replay the change.
+        """
+        if self._journal is None:
+            self._journal = open(self.journal_file, "ab", buffering=64 * 1024)
+        self._seq += 1
+        entry = {'op': op, 'seq': self._seq, **payload}
+        self._journal.write(_dumps(entry) + b"\n")
+        self._journal.flush()
+        self._track(entry)
+        self._dirty = True
+        if self._journal.tell() > self.JOURNAL_LIMIT:
+            self.save_data()
+
+    def _track(self, entry):
+        """
+        Note which record a journal entry changes, so a SQLite save can write just that row.
+        Args:
+            entry (dict): A journal record, as written by _log().
+        """
+        if self._store is None:
+            return
+        op = entry.get('op')
+        if op == 'put_department':
+            self._changed_departments.add(entry['name'])
+            return
+        if op == 'put_patient':
+            patient_number = Patient.coerce_number(entry['patient']['patient_number'])
+        else:
+            patient_number = Patient.coerce_number(entry['patient_number'])
+        if op == 'remove_patient':
+            self._changed_patients.discard(patient_number)
+            self._removed_patients.add(patient_number)
+        else:
+            self._removed_patients.discard(patient_number)
+            self._changed_patients.add(patient_number)
+
+    def _log_patient(self, patient):
+        """
+        Record the current state of a patient in the journal.
+        Args:
+            patient (Patient): The patient that was added or changed.
+        """
+        patient.mark_dirty()
+        self._log('put_patient', patient=patient.to_dict())
+
+    def _log_department(self, name):
+        """
+        Record the current state of a department in the journal.
+        Args:
+            name (str): Name of the department that was added or changed.
+        """
+        dept = self.departments[name]
+        dept.mark_dirty()
+        self._log('put_department', name=name, department=dept.to_dict())
+
+    def _replay_journal(self):
+        """
+        Re-apply the changes recorded in the journal on top of the loaded database file.
+        Records with a sequence number the database file already includes are skipped.
+        """
+        try:
+            with open(self.journal_file, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return
+        if raw:
+            self._dirty = True
+        if raw and not raw.endswith(b"\n"):
+            # Drop a torn last record from an interrupted write so new records start on a fresh line
+            raw = raw[:raw.rfind(b"\n") + 1]
+            with open(self.journal_file, "r+b") as f:
+                f.truncate(len(raw))
+        positions = {p.patient_number: i for i, p in enumerate(self.patients)}
+        for line in raw.splitlines():
+            try:
+                entry = _loads(line)
+            except ValueError:
+                continue
+            seq = entry.get('seq')
+            if seq is not None:
+                if seq <= self._seq:
+                    continue
+                self._seq = seq
+            self._track(entry)
+            op = entry.get('op')
+            if op == 'put_patient':
+                patient = Patient.from_dict(entry['patient'])
+                idx = positions.get(patient.patient_number)
+                if idx is None:
+                    positions[patient.patient_number] = len(self.patients)
+                    self.patients.append(patient)
+                else:
+                    self.patients[idx] = patient
+            elif op == 'remove_patient':
+                patient_number = Patient.coerce_number(entry['patient_number'])
+                if positions.pop(patient_number, None) is not None:
+                    self.patients = [p for p in self.patients if p.patient_number != patient_number]
+                    positions = {p.patient_number: i for i, p in enumerate(self.patients)}
+            elif op in ('add_bill', 'mark_bill_paid', 'add_procedure'):
+                # Small records that change one patient instead of restating it
+                idx = positions.get(Patient.coerce_number(entry['patient_number']))
+                if idx is None:
+                    continue
+                patient = self.patients[idx]
+                if op == 'add_bill':
+                    bill = entry['bill']
+                    patient.add_bill(Billing(bill['amount'], bill['description'], bill.get('paid', False)))
+                elif op == 'mark_bill_paid':
+                    if 0 <= entry['index'] < len(patient.billing):
+                        patient.billing.mark_paid(entry['index'])
+                        patient.mark_dirty()
+                else:
+                    patient.add_procedure(entry['date'], entry['description'])
+            elif op == 'put_department':
+                self.departments.set_raw(entry['name'], entry['department'])
+
+    def _snapshot(self):
+        """
+        Returns:
+            dict: All patients and departments, in the database file layout.
+                Patients are left as objects; the encoders turn them into dicts.
+        """
+        # 'seq' comes first so a streaming reader finds it without scanning the patients
+        return {
+            'seq': self._seq,
+            'patients': self.patients,
+            'departments': self.departments.to_dict()
         }
-        with open(self.db_file, "w") as f:
-            json.dump(data, f, indent=2)
+
+    def export_pretty(self, path=None):
+        """
+        Write the current data as indented JSON for reading by hand.
+        The database file itself is saved compact; this is only for inspection.
+        Args:
+            path (str, optional): Output file. Defaults to the database path with '.pretty.json' appended.
+        Returns:
+            str: The path written.
+        """
+        path = path or self.db_file + ".pretty.json"
+        with open(path, "wb") as f:
+            f.write(_dumps(self._snapshot(), indent=True))
+        return path
+
+    def save_data(self, pretty=False):
+        """
+        Save all hospital data (patients, departments, staff) to the database file
+        and clear the journal, since the saved file now contains its changes.
+        Nothing is written when there are no unsaved changes and the file exists,
+        unless pretty output is requested.
+        SQLite database files only get the patients and departments changed since the last save.
+        Args:
+            pretty (bool): Write indented JSON instead of the compact default; ignored for SQLite.
+        """
+        if not self._dirty and not pretty and os.path.exists(self.db_file):
+            print("No changes to save.")
+            return
+        if self._store is not None:
+            self._save_changed_records()
+        else:
+            data = self._snapshot()
+            # Write a temporary file and swap it in, so a crash never leaves a half-written database
+            tmp_file = self.db_file + ".tmp"
+            if (orjson is None and len(self.patients) > STREAM_SAVE_PATIENTS
+                    and not self.db_file.endswith(MSGPACK_EXTENSIONS)):
+                # The stdlib encoder would build the whole document as one string first;
+                # stream its chunks through a 64 KB buffer instead to keep peak memory down
+                encoder = json.JSONEncoder(default=_default, indent=2 if pretty else None,
+                                           separators=None if pretty else (',', ':'))
+                with open(tmp_file, "w", encoding="utf-8", buffering=64 * 1024) as f:
+                    for chunk in encoder.iterencode(data):
+                        f.write(chunk)
+                    f.flush()
+                    os.fsync(f.fileno())
+            else:
+                payload = _encode_snapshot(data, self.db_file, pretty)
+                with open(tmp_file, "wb", buffering=1 << 20) as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(tmp_file, self.db_file)
+            HospitalSystem._snapshot_cache.pop(os.path.abspath(self.db_file), None)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        try:
+            os.remove(self.journal_file)
+        except FileNotFoundError:
+            pass
+        self._dirty = False
         print("Data saved.")
 
+    def _save_changed_records(self):
+        """
+        Write the patients and departments changed since the last save to the SQLite
+        database file, and delete removed patients, in one transaction.
+        """
+        patients = []
+        for patient_number in self._changed_patients:
+            patient = self._by_number.get(str(patient_number))
+            if patient is not None:
+                patients.append((patient_number, _dumps(patient.to_dict())))
+        departments = [
+            (name, _dumps(self.departments.record(name)))
+            for name in self._changed_departments if name in self.departments
+        ]
+        self._store.write(patients, self._removed_patients, departments, self._seq)
+        self._changed_patients.clear()
+        self._removed_patients.clear()
+        self._changed_departments.clear()
+
+    def _flush_if_dirty(self):
+        """
+        Fold outstanding journal records into the database file, if there are any.
+        Registered with atexit, so a session always ends with a compact database file.
+        """
+        if self._dirty:
+            self.save_data()
+
+    def close(self):
+        """
+        Save outstanding changes, release the journal and database files, and drop
+        the atexit hook, so nothing is written for this instance at interpreter exit.
+        """
+        self._flush_if_dirty()
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+        atexit.unregister(self._flush_if_dirty)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _iter_snapshot(self):
+        """
+        Read the database file record by record.
+        With ijson installed, JSON files are parsed incrementally, so the whole
+        document is never held in memory next to the objects built from it.
+        Yields:
+            tuple: ('seq', number) for the last journal record the file includes, then
+                ('patient', patient_dict) for each patient and
+                ('department', (name, department_dict)) for each department.
+        """
+        if self._store is not None:
+            yield from self._store.iter_records(_loads)
+            return
+        with open(self.db_file, "rb") as f:
+            if ijson is not None and not self.db_file.endswith(MSGPACK_EXTENSIONS):
+                yield 'seq', next(ijson.items(f, 'seq'), 0)
+                f.seek(0)
+                for record in ijson.items(f, 'patients.item', use_float=True):
+                    yield 'patient', record
+                f.seek(0)
+                for item in ijson.kvitems(f, 'departments', use_float=True):
+                    yield 'department', item
+                return
+            data = _decode_snapshot(f.read())
+        yield 'seq', data.get('seq', 0)
+        for record in data.get('patients', []):
+            yield 'patient', record
+        for item in data.get('departments', {}).items():
+            yield 'department', item
+
+    def _snapshot_records(self):
+        """
+        The records of the database file, as yielded by _iter_snapshot(), taken
+        from the in-process cache when CACHE_SNAPSHOTS is on and the file is unchanged.
+        Returns:
+            iterable: ('seq', number), ('patient', dict) and ('department', (name, dict)) tuples.
+        """
+        # SQLite writes land in its WAL file first, so the database file's mtime and size miss them
+        if not self.CACHE_SNAPSHOTS or self._store is not None:
+            return self._iter_snapshot()
+        path = os.path.abspath(self.db_file)
+        st = os.stat(path)
+        key = (st.st_mtime_ns, st.st_size)
+        cached = HospitalSystem._snapshot_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        records = list(self._iter_snapshot())
+        HospitalSystem._snapshot_cache[path] = (key, records)
+        return records
+
     def load_data(self):
         """
-        Load hospital data (patients, departments, staff) from the database file.
+        Load hospital data (patients, departments, staff) from the database file,
+        then apply any changes recorded in the journal since it was last saved.
         """
+        self.patients = []
+        department_records = []
+        self._seq = 0
+        # Deduplicate by patient_number before building the Patient objects
+        seen = set()
         try:
-            with open(self.db_file, "r") as f:
-                data = json.load(f)
-                loaded_patients = [Patient.from_dict(p) for p in data.get('patients', [])]
-                # Deduplicate by patient_number
-                seen = set()
-                self.patients = []
-                for p in loaded_patients:
-                    if p.patient_number not in seen:
-                        self.patients.append(p)
-                        seen.add(p.patient_number)
-                self.rooms = {p.room_number: p.name for p in self.patients if p.room_number}
-                self.departments = {}
-                for name, dept in data.get('departments', {}).items():
-                    department = Department(name)
-                    for s in dept.get('staff', []):
-                        staff = Staff(s['name'], s['age'], s['position'], s['phone_number'], s['date_of_birth'], s['gender'], s['email'], s['address'], s['identifier'])
-                        department.add_staff(staff)
-                    self.departments[name] = department
-        except (FileNotFoundError, json.JSONDecodeError):
+            for kind, record in self._snapshot_records():
+                if kind == 'patient':
+                    patient_number = Patient.coerce_number(record['patient_number'])
+                    if patient_number in seen:
+                        continue
+                    seen.add(patient_number)
+                    self.patients.append(Patient.from_dict(record))
+                elif kind == 'seq':
+                    self._seq = record
+                else:
+                    department_records.append(record)
+        except FileNotFoundError:
+            pass
+        except DECODE_ERRORS:
+            # Unreadable file: start empty, as before
             self.patients = []
-            self.rooms = {}
-            self.departments = {}
+            department_records = []
+            self._seq = 0
+        # Departments are only built from their records when first used
+        self.departments = _LazyDepartments()
+        for name, dept in department_records:
+            self.departments.set_raw(name, dept)
+        self._replay_journal()
+        self.rooms = {p.room_number: p.name for p in self.patients if p.room_number}
+        self._rebuild_indexes()
+        # self.patients already holds everything in the database file and journal
+        self._next_patient_number = max(
+            (p.patient_number for p in self.patients if isinstance(p.patient_number, int)),
+            default=1000
+        ) + 1
 
     def edit_patient(self, patient):
         """
@@ -299,6 +914,7 @@ class HospitalSystem:
             patient (Patient): The patient to edit.
         """
         print(f"Editing patient: {patient.name} (Number: {patient.patient_number})")
+        before = _PATIENT_EDIT_FIELDS(patient)
         new_name = input(f"New name (leave blank to keep '{patient.name}'): ") or patient.name
         new_age = input(f"New age (leave blank to keep '{patient.age}'): ") or patient.age
         new_phone_number = input(f"New phone number (leave blank to keep '{patient.phone_number}'): ") or patient.phone_number
@@ -311,9 +927,9 @@ class HospitalSystem:
         new_status = input(f"New status (normal/surgery/emergency/death, leave blank to keep '{patient.status}'): ") or patient.status
         # Next of kin logic
         has_kin = input("Is there a next of kin? (yes/no, leave blank to keep current): ").strip().lower()
-        if has_kin in ['no', 'n']:
+        if has_kin in _NO_ANSWERS:
             new_patient_next_of_kin = None
-        elif has_kin in ['yes', 'y']:
+        elif has_kin in _YES_ANSWERS:
             kin = patient.patient_next_of_kin if isinstance(patient.patient_next_of_kin, dict) else {'name': '', 'number': '', 'email': '', 'relation': ''}
             kin_name = input(f"Next of kin name (leave blank to keep '{kin.get('name','')}'): ") or kin.get('name','')
             kin_number = input(f"Next of kin number (leave blank to keep '{kin.get('number','')}'): ") or kin.get('number','')
@@ -331,16 +947,16 @@ class HospitalSystem:
         new_discharge_date = input(f"Discharge date (YYYY-MM-DD, leave blank to keep '{getattr(patient, 'discharge_date', None)}'): ") or getattr(patient, 'discharge_date', None)
         # Insurance info
         has_insurance = input("Does the patient have insurance? (yes/no, leave blank to keep current): ").strip().lower()
-        if has_insurance in ['no', 'n']:
+        if has_insurance in _NO_ANSWERS:
             new_insurance = {'provider': '', 'policy_number': '', 'coverage_percent': 0}
-        elif has_insurance in ['yes', 'y']:
-            ins = patient.insurance if isinstance(patient.insurance, dict) else {'provider': '', 'policy_number': '', 'coverage_percent': 0}
-            provider = input(f"Insurance provider (leave blank to keep '{ins.get('provider','')}'): ") or ins.get('provider','')
-            policy_number = input(f"Policy number (leave blank to keep '{ins.get('policy_number','')}'): ") or ins.get('policy_number','')
+        elif has_insurance in _YES_ANSWERS:
+            ins = patient.insurance
+            provider = input(f"Insurance provider (leave blank to keep '{ins['provider']}'): ") or ins['provider']
+            policy_number = input(f"Policy number (leave blank to keep '{ins['policy_number']}'): ") or ins['policy_number']
             try:
-                coverage_percent = float(input(f"Coverage percent (0-100, leave blank to keep '{ins.get('coverage_percent',0)}'): ") or ins.get('coverage_percent',0))
+                coverage_percent = float(input(f"Coverage percent (0-100, leave blank to keep '{ins['coverage_percent']}'): ") or ins['coverage_percent'])
             except ValueError:
-                coverage_percent = ins.get('coverage_percent',0)
+                coverage_percent = ins['coverage_percent']
             new_insurance = {'provider': provider, 'policy_number': policy_number, 'coverage_percent': coverage_percent}
         else:
             new_insurance = patient.insurance
@@ -359,14 +975,22 @@ class HospitalSystem:
         patient.register_date = new_register_date
         patient.discharge_date = new_discharge_date
         patient.insurance = new_insurance
+        if _PATIENT_EDIT_FIELDS(patient) == before:
+            print("No changes made.")
+            return
+        # Name or identifier may have changed
+        self._rebuild_indexes()
         print("Patient updated.")
-        self.save_data()
+        self._log_patient(patient)
 
     def remove_patient(self, patient):
-        if patient in self.patients:
-            self.patients.remove(patient)
+        # Match by identity: legacy records may share an identifier with another patient
+        idx = next((i for i, p in enumerate(self.patients) if p is patient), None)
+        if idx is not None:
+            del self.patients[idx]
+            self._rebuild_indexes()
             print(f"Patient '{patient.name}' (Number: {patient.patient_number}) removed.")
-            self.save_data()
+            self._log('remove_patient', patient_number=patient.patient_number)
         else:
             print("Patient not found.")
 
@@ -374,12 +998,13 @@ class HospitalSystem:
         if dept_name not in self.departments:
             print(f"Department '{dept_name}' does not exist.")
             return
-        staff_list = self.departments[dept_name].staff
-        staff = next((s for s in staff_list if s.name == staff_name), None)
+        dept = self.departments[dept_name]
+        staff = dept.find_staff(staff_name)
         if not staff:
             print("Staff not found.")
             return
         print(f"Editing staff: {staff.name}")
+        before = _STAFF_EDIT_FIELDS(staff)
         new_name = input(f"New name (leave blank to keep '{staff.name}'): ") or staff.name
         new_age = input(f"New age (leave blank to keep '{staff.age}'): ") or staff.age
         new_position = input(f"New position (leave blank to keep '{staff.position}'): ") or staff.position
@@ -389,6 +1014,7 @@ class HospitalSystem:
         new_email = input(f"New email (leave blank to keep '{staff.email}'): ") or staff.email
         new_address = input(f"New address (leave blank to keep '{staff.address}'): ") or staff.address
         new_identifier = input(f"New identifier (leave blank to keep '{staff.identifier}'): ") or staff.identifier
+        old_identifier = staff.identifier
         staff.name = new_name
         staff.age = int(new_age)
         staff.position = new_position
@@ -398,34 +1024,39 @@ class HospitalSystem:
         staff.email = new_email
         staff.address = new_address
         staff.identifier = new_identifier
+        if _STAFF_EDIT_FIELDS(staff) == before:
+            print("No changes made.")
+            return
+        if new_name != staff_name or new_identifier != old_identifier:
+            dept.reindex_staff()
         print("Staff updated.")
-        self.save_data()
+        self._log_department(dept_name)
 
     def remove_staff_from_department(self, dept_name, staff_name):
         if dept_name not in self.departments:
             print(f"Department '{dept_name}' does not exist.")
             return
-        staff_list = self.departments[dept_name].staff
-        staff = next((s for s in staff_list if s.name == staff_name), None)
-        if staff:
-            staff_list.remove(staff)
+        dept = self.departments[dept_name]
+        staff = dept.find_staff(staff_name)
+        if staff is not None:
+            dept.remove_staff(staff)
             print(f"Staff '{staff_name}' removed from department '{dept_name}'.")
-            self.save_data()
+            self._log_department(dept_name)
         else:
             print("Staff not found.")
 
     def update_patient_status(self, name):
-        patient = next((p for p in self.patients if p.name == name), None)
+        patient = self._by_name.get(name)
         if patient:
             new_status = input(f"Enter new status for {name} (normal/surgery/emergency/death): ")
-            if new_status in ['normal', 'surgery', 'emergency', 'death']:
-                patient.status = new_status
+            if new_status in _VALID_STATUS:
+                patient.status = sys.intern(new_status)
                 if new_status == 'death':
                     patient.date_of_death = input("Enter date of death (YYYY-MM-DD): ")
                 else:
                     patient.date_of_death = None
                 print(f"Status updated to {new_status}.")
-                self.save_data()
+                self._log_patient(patient)
             else:
                 print("Invalid status.")
         else:
@@ -435,17 +1066,18 @@ class HospitalSystem:
         if not patient.billing:
             print("No bills to mark as paid.")
             return
-        table = PrettyTable()
-        table.field_names = ["Index", "Description", "Amount", "Paid"]
-        for idx, bill in enumerate(patient.billing):
-            table.add_row([idx, bill.description, bill.amount, "Yes" if bill.paid else "No"])
-        print(table)
+        billing = patient.billing
+        _print_table(_INDEXED_BILL_FIELDS, [
+            [idx, description, amount, "Yes" if paid else "No"]
+            for idx, (description, amount, paid) in enumerate(zip(billing.descriptions, billing.amounts, billing.paid))
+        ])
         try:
             bill_idx = int(input("Enter the index of the bill to mark as paid: "))
             if 0 <= bill_idx < len(patient.billing):
-                patient.billing[bill_idx].mark_paid()
+                patient.billing.mark_paid(bill_idx)
+                patient.mark_dirty()
                 print("Bill marked as paid.")
-                self.save_data()
+                self._log('mark_bill_paid', patient_number=patient.patient_number, index=bill_idx)
             else:
                 print("Invalid index.")
         except ValueError:
@@ -453,259 +1085,297 @@ class HospitalSystem:
 
     def find_patient(self, identifier):
         # identifier can be name or patient_number (as str or int)
-        for p in self.patients:
-            if p.name == identifier or str(p.patient_number) == str(identifier):
-                return p
-        return None
+        return self._by_name.get(identifier) or self._by_number.get(str(identifier))
 
     def add_procedure_to_patient(self, patient):
         date = input("Enter procedure date (YYYY-MM-DD): ")
         description = input("Enter procedure description: ")
         patient.add_procedure(date, description)
         print("Procedure added.")
-        self.save_data()
+        self._log('add_procedure', patient_number=patient.patient_number, date=date, description=description)
 
     def view_patient_procedures(self, patient):
-        procedures = patient.view_procedures()
+        procedures = patient.procedures
         if not procedures:
             print("No procedures recorded.")
             return
-        table = PrettyTable()
-        table.field_names = ["Date", "Description"]
-        for proc in procedures:
-            table.add_row([proc['date'], proc['description']])
-        print(table)
+        _print_table(_PROCEDURE_FIELDS, [list(row) for row in zip(procedures.dates, procedures.descriptions)])
 
     def generate_bills_from_procedures(self, patient):
-        unbilled = [(i, proc) for i, proc in enumerate(patient.procedures) if not proc.get('billed', False)]
+        amounts = self.collect_bill_amounts(patient)
+        if amounts:
+            self.apply_bill_amounts(patient, amounts)
+
+    def collect_bill_amounts(self, patient):
+        """
+        Ask for a bill amount for each unbilled procedure of a patient.
+        Args:
+            patient (Patient): The patient whose procedures are billed.
+        Returns:
+            dict: Procedure index -> bill amount, without the skipped procedures.
+        """
+        procedures = patient.procedures
+        unbilled = procedures.unbilled()
         if not unbilled:
             print("No unbilled procedures found.")
-            return
-        for idx, proc in unbilled:
-            print(f"Procedure: {proc['description']} on {proc['date']}")
+            return {}
+        amounts = {}
+        for idx in unbilled:
+            print(f"Procedure: {procedures.descriptions[idx]} on {procedures.dates[idx]}")
             try:
-                amount = float(input("Enter bill amount for this procedure: "))
+                amounts[idx] = float(input("Enter bill amount for this procedure: "))
             except ValueError:
                 print("Invalid amount. Skipping.")
+        return amounts
+
+    def apply_bill_amounts(self, patient, amounts):
+        """
+        Bill procedures of a patient and mark them as billed, with a single journal record.
+        Args:
+            patient (Patient): The patient whose procedures are billed.
+            amounts (dict): Procedure index -> bill amount.
+        """
+        procedures = patient.procedures
+        billed = 0
+        for idx, amount in amounts.items():
+            if not 0 <= idx < len(procedures) or procedures.billed[idx]:
                 continue
-            desc = f"Procedure: {proc['description']} on {proc['date']}"
-            bill = Billing(amount, desc)
-            patient.add_bill(bill)
+            patient.add_bill(Billing(amount, f"Procedure: {procedures.descriptions[idx]} on {procedures.dates[idx]}"))
             patient.mark_procedure_billed(idx)
+            billed += 1
             print("Bill generated and procedure marked as billed.")
+        if billed:
+            self._log_patient(patient)
+
+    def _opt_view_patients(self):
+        # Pieces of every line go into one list and are written with a single call
+        parts = []
+        append = parts.append
+        for p in self.patients:
+            append(f"Number: {p.patient_number}, Name: {p.name}, Age: {p.age}, Condition: {p.condition}, Identifier: {p.identifier}, Phone Number: {p.phone_number}, Date of Birth: {p.date_of_birth}, Gender: {p.gender}, Email: {p.email}, Address: {p.address}, Room: {p.room_number}, Bills: {len(p.billing)}, Status: {p.status}")
+            if p.register_date:
+                append(f", Register Date: {p.register_date}")
+            if p.discharge_date:
+                append(f", Discharge Date: {p.discharge_date}")
+            kin = p.patient_next_of_kin
+            if isinstance(kin, dict):
+                append(f", Next of Kin: {kin.get('name','')} ({kin.get('relation','')}), Number: {kin.get('number','')}, Email: {kin.get('email','')}")
+            if p.status == 'death' and p.date_of_death:
+                append(f", Date of Death: {p.date_of_death}")
+            append("\n")
+        sys.stdout.write("".join(parts))
+
+    def _opt_view_rooms(self):
+        sys.stdout.write("".join(f"Room {room}: {name}\n" for room, name in self.rooms.items()))
+
+    def _opt_add_patient(self):
+        name = input("Patient name: ")
+        age = int(input("Age: "))
+        condition = input("Condition: ")
+        phone_number = input("Phone number: ")
+        date_of_birth = input("Date of birth: ")
+        gender = input("Gender: ")
+        email = input("Email: ")
+        address = input("Address: ")
+        identifier = input("Patient identifier: ")
+        room = input("Room number (optional): ")
+        room = int(room) if room else None
+        # Next of kin logic
+        has_kin = input("Is there a next of kin? (yes/no): ").strip().lower()
+        if has_kin in _YES_ANSWERS:
+            kin_name = input("Next of kin name: ")
+            kin_number = input("Next of kin number: ")
+            kin_email = input("Next of kin email: ")
+            kin_relation = input("Relation to patient: ")
+            patient_next_of_kin = {'name': kin_name, 'number': kin_number, 'email': kin_email, 'relation': kin_relation}
+        else:
+            patient_next_of_kin = None
+        # Insurance info
+        has_insurance = input("Does the patient have insurance? (yes/no): ").strip().lower()
+        if has_insurance in _YES_ANSWERS:
+            provider = input("Insurance provider: ")
+            policy_number = input("Policy number: ")
+            try:
+                coverage_percent = float(input("Coverage percent (0-100): "))
+            except ValueError:
+                coverage_percent = 0
+            insurance = {'provider': provider, 'policy_number': policy_number, 'coverage_percent': coverage_percent}
+        else:
+            insurance = {'provider': '', 'policy_number': '', 'coverage_percent': 0}
+        self.add_patient(name, age, condition, phone_number, date_of_birth, gender, email, address, identifier, patient_next_of_kin, room, insurance)
+
+    def _opt_assign_room(self):
+        identifier = input("Patient name or number to assign room: ")
+        room = int(input("Room number: "))
+        patient = self.find_patient(identifier)
+        if patient:
+            if patient.status == 'death':
+                print("Cannot assign room: patient is deceased.")
+            else:
+                self.assign_room(patient, room)
+        else:
+            print("Patient not found.")
+
+    def _opt_generate_bill(self):
+        identifier = input("Patient name or number for billing: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            if patient.status == 'death':
+                print("Cannot generate bill: patient is deceased.")
+            else:
+                amount = float(input("Bill amount: "))
+                desc = input("Description: ")
+                self.generate_bill(patient, amount, desc)
+        else:
+            print("Patient not found.")
+
+    def _opt_view_bills(self):
+        identifier = input("Patient name or number to view bills: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.view_bills(patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_mark_bill_paid(self):
+        identifier = input("Patient name or number to mark bill as paid: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.mark_bill_paid(patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_add_department(self):
+        dept_name = input("Department name: ")
+        self.add_department(dept_name)
+
+    def _opt_add_staff(self):
+        dept_name = input("Department name: ")
+        staff_name = input("Staff name: ")
+        staff_age = int(input("Staff age: "))
+        staff_position = input("Staff position: ")
+        staff_phone_number = input("Staff phone number: ")
+        staff_date_of_birth = input("Staff date of birth: ")
+        staff_gender = input("Staff gender: ")
+        staff_email = input("Staff email: ")
+        staff_address = input("Staff address: ")
+        staff_identifier = input("Staff identifier: ")
+        specialty = input("Specialty (leave blank for general): ") or None
+        self.add_staff_to_department(dept_name, staff_name, staff_age, staff_position, staff_phone_number, staff_date_of_birth, staff_gender, staff_email, staff_address, staff_identifier, specialty)
+
+    def _opt_add_staff_csv(self):
+        line = input("department,name,age,position,phone,date of birth,gender,email,address,identifier[,specialty]: ")
+        # skipinitialspace lets quoted fields follow ', '; strip() removes any other padding
+        row = [field.strip() for field in next(csv.reader([line], skipinitialspace=True), [])]
+        if len(row) not in (10, 11):
+            print("Expected 10 or 11 comma-separated fields.")
+            return
+        try:
+            staff_age = int(row[2])
+        except ValueError:
+            print(f"Invalid age '{row[2]}'.")
+            return
+        specialty = row[10] if len(row) == 11 and row[10] else None
+        self.add_staff_to_department(row[0], row[1], staff_age, *row[3:10], specialty)
+
+    def _opt_view_department_staff(self):
+        dept_name = input("Department name: ")
+        self.view_department_staff(dept_name)
+
+    def _opt_edit_patient(self):
+        identifier = input("Patient name or number to edit: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.edit_patient(patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_remove_patient(self):
+        identifier = input("Patient name or number to remove: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            if patient.status == 'normal':
+                self.remove_patient(patient)
+            elif patient.status == 'death':
+                print("Cannot remove patient: patient is deceased. Record is kept for history.")
+            else:
+                print("Patient status is not normal.")
+        else:
+            print("Patient not found.")
+
+    def _opt_edit_staff(self):
+        dept_name = input("Department name: ")
+        staff_name = input("Staff name to edit: ")
+        self.edit_staff_in_department(dept_name, staff_name)
+
+    def _opt_remove_staff(self):
+        dept_name = input("Department name: ")
+        staff_name = input("Staff name to remove: ")
+        self.remove_staff_from_department(dept_name, staff_name)
+
+    def _opt_update_status(self):
+        identifier = input("Patient name or number to update status: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.update_patient_status(patient.name)
+        else:
+            print("Patient not found.")
+
+    def _opt_add_procedure(self):
+        identifier = input("Patient name or number to add procedure: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.add_procedure_to_patient(patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_view_procedures(self):
+        identifier = input("Patient name or number to view procedures: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.view_patient_procedures(patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_bill_procedures(self):
+        identifier = input("Patient name or number to generate bills from procedures: ")
+        patient = self.find_patient(identifier)
+        if patient:
+            self.generate_bills_from_procedures(patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_save(self):
         self.save_data()
 
+    def _opt_exit(self):
+        save = input("Save data before exit? (y/n): ")
+        if save.lower() in _YES_ANSWERS:
+            self.save_data()
+        print("Goodbye!")
+        return True
+
+    def _opt_assign_doctor(self):
+        dept_name = input("Department name: ")
+        doctor_name = input("Doctor's name: ")
+        patient_identifier = input("Patient name or number to assign: ")
+        patient = self.find_patient(patient_identifier)
+        if patient:
+            self.assign_patient_to_doctor_in_department(dept_name, doctor_name, patient)
+        else:
+            print("Patient not found.")
+
+    def _opt_view_doctor_patients(self):
+        dept_name = input("Department name: ")
+        doctor_name = input("Doctor's name: ")
+        self.view_doctor_patients(dept_name, doctor_name)
+
     def main_menu(self):
         while True:
-            print("\n" + "="*50)
-            print("Capital Hospital - Patient Management System")
-            print("="*50)
-            print("1. View Patients")
-            print("2. View Rooms")
-            print("3. Add Patient")
-            print("4. Assign Room")
-            print("5. Generate Bill")
-            print("6. View Patient Bills")
-            print("7. Mark Bill as Paid")
-            print("8. Add Department")
-            print("9. Add Staff to Department")
-            print("10. View Department Staff")
-            print("11. Edit Patient")
-            print("12. Remove Patient")
-            print("13. Edit Staff in Department")
-            print("14. Remove Staff from Department")
-            print("15. Update Patient Status")
-            print("16. Add Procedure to Patient")
-            print("17. View Patient Procedures")
-            print("18. Generate Bills from Procedures")
-            print("19. Save Data")
-            print("20. Exit")
-            print("21. Assign Patient to Doctor")
-            print("22. View Doctor's Patients")
-            print("-"*50)
-            choice = input("Select option (1-22): ")
-            if choice == '1':
-                for p in self.patients:
-                    details = f"Number: {p.patient_number}, Name: {p.name}, Age: {p.age}, Condition: {p.condition}, Identifier: {p.identifier}, Phone Number: {p.phone_number}, Date of Birth: {p.date_of_birth}, Gender: {p.gender}, Email: {p.email}, Address: {p.address}, Room: {p.room_number}, Bills: {len(p.billing)}, Status: {p.status}"
-                    if getattr(p, 'register_date', None):
-                        details += f", Register Date: {p.register_date}"
-                    if getattr(p, 'discharge_date', None):
-                        details += f", Discharge Date: {p.discharge_date}"
-                    if isinstance(p.patient_next_of_kin, dict):
-                        kin = p.patient_next_of_kin
-                        details += f", Next of Kin: {kin.get('name','')} ({kin.get('relation','')}), Number: {kin.get('number','')}, Email: {kin.get('email','')}"
-                    if p.status == 'death' and p.date_of_death:
-                        details += f", Date of Death: {p.date_of_death}"
-                    print(details)
-            elif choice == '2':
-                for room, name in self.rooms.items():
-                    print(f"Room {room}: {name}")
-            elif choice == '3':
-                name = input("Patient name: ")
-                age = int(input("Age: "))
-                condition = input("Condition: ")
-                phone_number = input("Phone number: ")
-                date_of_birth = input("Date of birth: ")
-                gender = input("Gender: ")
-                email = input("Email: ")
-                address = input("Address: ")
-                identifier = input("Patient identifier: ")
-                room = input("Room number (optional): ")
-                room = int(room) if room else None
-                # Next of kin logic
-                has_kin = input("Is there a next of kin? (yes/no): ").strip().lower()
-                if has_kin in ['yes', 'y']:
-                    kin_name = input("Next of kin name: ")
-                    kin_number = input("Next of kin number: ")
-                    kin_email = input("Next of kin email: ")
-                    kin_relation = input("Relation to patient: ")
-                    patient_next_of_kin = {'name': kin_name, 'number': kin_number, 'email': kin_email, 'relation': kin_relation}
-                else:
-                    patient_next_of_kin = None
-                # Insurance info
-                has_insurance = input("Does the patient have insurance? (yes/no): ").strip().lower()
-                if has_insurance in ['yes', 'y']:
-                    provider = input("Insurance provider: ")
-                    policy_number = input("Policy number: ")
-                    try:
-                        coverage_percent = float(input("Coverage percent (0-100): "))
-                    except ValueError:
-                        coverage_percent = 0
-                    insurance = {'provider': provider, 'policy_number': policy_number, 'coverage_percent': coverage_percent}
-                else:
-                    insurance = {'provider': '', 'policy_number': '', 'coverage_percent': 0}
-                self.add_patient(name, age, condition, phone_number, date_of_birth, gender, email, address, identifier, patient_next_of_kin, room, insurance)
-            elif choice == '4':
-                identifier = input("Patient name or number to assign room: ")
-                room = int(input("Room number: "))
-                patient = self.find_patient(identifier)
-                if patient:
-                    if patient.status == 'death':
-                        print("Cannot assign room: patient is deceased.")
-                    else:
-                        self.assign_room(patient, room)
-                else:
-                    print("Patient not found.")
-            elif choice == '5':
-                identifier = input("Patient name or number for billing: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    if patient.status == 'death':
-                        print("Cannot generate bill: patient is deceased.")
-                    else:
-                        amount = float(input("Bill amount: "))
-                        desc = input("Description: ")
-                        self.generate_bill(patient, amount, desc)
-                else:
-                    print("Patient not found.")
-            elif choice == '6':
-                identifier = input("Patient name or number to view bills: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.view_bills(patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '7':
-                identifier = input("Patient name or number to mark bill as paid: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.mark_bill_paid(patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '8':
-                dept_name = input("Department name: ")
-                self.add_department(dept_name)
-            elif choice == '9':
-                dept_name = input("Department name: ")
-                staff_name = input("Staff name: ")
-                staff_age = int(input("Staff age: "))
-                staff_position = input("Staff position: ")
-                staff_phone_number = input("Staff phone number: ")
-                staff_date_of_birth = input("Staff date of birth: ")
-                staff_gender = input("Staff gender: ")
-                staff_email = input("Staff email: ")
-                staff_address = input("Staff address: ")
-                staff_identifier = input("Staff identifier: ")
-                specialty = input("Specialty (leave blank for general): ") or None
-                self.add_staff_to_department(dept_name, staff_name, staff_age, staff_position, staff_phone_number, staff_date_of_birth, staff_gender, staff_email, staff_address, staff_identifier, specialty)
-            elif choice == '10':
-                dept_name = input("Department name: ")
-                self.view_department_staff(dept_name)
-            elif choice == '11':
-                identifier = input("Patient name or number to edit: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.edit_patient(patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '12':
-                identifier = input("Patient name or number to remove: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    if patient.status == 'normal':
-                        self.remove_patient(patient)
-                    elif patient.status == 'death':
-                        print("Cannot remove patient: patient is deceased. Record is kept for history.")
-                    else:
-                        print("Patient status is not normal.")
-                else:
-                    print("Patient not found.")
-            elif choice == '13':
-                dept_name = input("Department name: ")
-                staff_name = input("Staff name to edit: ")
-                self.edit_staff_in_department(dept_name, staff_name)
-            elif choice == '14':
-                dept_name = input("Department name: ")
-                staff_name = input("Staff name to remove: ")
-                self.remove_staff_from_department(dept_name, staff_name)
-            elif choice == '15':
-                identifier = input("Patient name or number to update status: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.update_patient_status(patient.name)
-                else:
-                    print("Patient not found.")
-            elif choice == '16':
-                identifier = input("Patient name or number to add procedure: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.add_procedure_to_patient(patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '17':
-                identifier = input("Patient name or number to view procedures: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.view_patient_procedures(patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '18':
-                identifier = input("Patient name or number to generate bills from procedures: ")
-                patient = self.find_patient(identifier)
-                if patient:
-                    self.generate_bills_from_procedures(patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '19':
-                self.save_data()
-            elif choice == '20':
-                save = input("Save data before exit? (y/n): ")
-                if save.lower() in ['y', 'yes']:
-                    self.save_data()
-                print("Goodbye!")
-                break
-            elif choice == '21':
-                dept_name = input("Department name: ")
-                doctor_name = input("Doctor's name: ")
-                patient_identifier = input("Patient name or number to assign: ")
-                patient = self.find_patient(patient_identifier)
-                if patient:
-                    self.assign_patient_to_doctor_in_department(dept_name, doctor_name, patient)
-                else:
-                    print("Patient not found.")
-            elif choice == '22':
-                dept_name = input("Department name: ")
-                doctor_name = input("Doctor's name: ")
-                self.view_doctor_patients(dept_name, doctor_name)
-            else:
+            sys.stdout.write(_MENU_TEXT)
+            choice = input("Select option (1-23): ")
+            handler = self._menu.get(choice)
+            if handler is None:
                 print("Invalid choice.")
+            elif handler():
+                break
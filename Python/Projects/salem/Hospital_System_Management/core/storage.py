@@ -0,0 +1,89 @@
+import sqlite3
+
+# Database files with these extensions are stored in SQLite instead of a single JSON/MessagePack document
+SQLITE_EXTENSIONS = ('.db', '.sqlite', '.sqlite3')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS patients (
+    patient_number TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS departments (
+    name TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+"""
+SQLite database file holding one encoded record per patient and per department,
+so a save only rewrites the rows that changed.
+Attributes:
+    path (str): Path to the SQLite file.
+    conn (sqlite3.Connection): Connection in autocommit mode; writes use explicit transactions.
+"""
+class SQLiteStore:
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(path, isolation_level=None)
+        # WAL appends changed pages to a log instead of rewriting the file in place;
+        # NORMAL sync is still crash-safe in WAL mode and skips an fsync per commit
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def iter_records(self, loads):
+        """
+        Read every stored record.
+        Args:
+            loads (callable): Decodes one stored record.
+        Yields:
+            tuple: ('seq', number) for the last journal record saved, then
+                ('patient', patient_dict) for each patient in insertion order and
+                ('department', (name, department_dict)) for each department.
+        """
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'seq'").fetchone()
+        yield 'seq', row[0] if row else 0
+        for (data,) in self.conn.execute("SELECT data FROM patients ORDER BY rowid"):
+            yield 'patient', loads(data)
+        for name, data in self.conn.execute("SELECT name, data FROM departments ORDER BY rowid"):
+            yield 'department', (name, loads(data))
+
+    def write(self, patients=(), removed=(), departments=(), seq=None):
+        """
+        Upsert changed records and delete removed patients in one transaction.
+        Args:
+            patients (iterable): (patient_number, encoded patient) pairs.
+            removed (iterable): Patient numbers to delete.
+            departments (iterable): (name, encoded department) pairs.
+            seq (int, optional): Sequence number of the last journal record these changes include.
+        """
+        conn = self.conn
+        conn.execute("BEGIN")
+        try:
+            conn.executemany("DELETE FROM patients WHERE patient_number = ?",
+                             [(str(number),) for number in removed])
+            # ON CONFLICT keeps the row (and its rowid, hence its position) instead of replacing it
+            conn.executemany(
+                "INSERT INTO patients (patient_number, data) VALUES (?, ?) "
+                "ON CONFLICT(patient_number) DO UPDATE SET data = excluded.data",
+                [(str(number), data) for number, data in patients])
+            conn.executemany(
+                "INSERT INTO departments (name, data) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET data = excluded.data",
+                departments)
+            if seq is not None:
+                conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('seq', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (seq,))
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self):
+        self.conn.close()
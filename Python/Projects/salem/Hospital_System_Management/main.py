@@ -13,8 +13,8 @@ def main():
             break
         else:
             print("Invalid username or password. Please try again.\n")
-    system = HospitalSystem()
-    system.main_menu()
+    with HospitalSystem() as system:
+        system.main_menu()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
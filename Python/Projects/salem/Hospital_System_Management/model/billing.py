@@ -1,3 +1,6 @@
+from array import array
+from itertools import compress
+
 """
 Represents a billing record for a patient.
 Attributes:
@@ -6,6 +9,8 @@ Attributes:
     paid (bool): Status indicating if the bill has been paid.
 """
 class Billing:
+    __slots__ = ('amount', 'description', 'paid')
+
     def __init__(self, amount, description, paid=False):
         self.amount = amount
         self.description = description
@@ -52,4 +57,134 @@ class Billing:
             float: The discounted amount to be paid by the patient.
         """
         discount = (insurance_coverage_percent / 100) * self.amount
-        return self.amount - discount 
\ No newline at end of file
+        return self.amount - discount 
+
+class BillingStore:
+    """
+    Column-oriented collection of a patient's bills.
+    Bills are kept as parallel arrays instead of one Billing object each.
+    Attributes:
+        amounts (array): Bill amounts as doubles.
+        descriptions (list): Bill descriptions.
+        paid (bytearray): 1 for each paid bill, 0 otherwise.
+        total_billed (float): Sum of all amounts, kept up to date as bills change.
+        total_paid (float): Sum of the paid amounts, kept up to date as bills change.
+    """
+    __slots__ = ('amounts', 'descriptions', 'paid', 'total_billed', 'total_paid')
+
+    def __init__(self, bills=None):
+        self.amounts = array('d')
+        self.descriptions = []
+        self.paid = bytearray()
+        self.total_billed = 0.0
+        self.total_paid = 0.0
+        for bill in bills or ():
+            self.append(bill)
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def __getitem__(self, index):
+        """
+        Get a bill by index.
+        Args:
+            index (int): The index of the bill.
+        Returns:
+            Billing: A copy of the bill; use mark_paid() to change the stored bill.
+        """
+        return Billing(self.amounts[index], self.descriptions[index], bool(self.paid[index]))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, bill):
+        """
+        Add a bill to the store.
+        Args:
+            bill (Billing): The bill to add.
+        """
+        self.amounts.append(bill.amount)
+        self.descriptions.append(bill.description)
+        self.paid.append(1 if bill.paid else 0)
+        self.total_billed += bill.amount
+        if bill.paid:
+            self.total_paid += bill.amount
+
+    def mark_paid(self, index):
+        """
+        Mark the bill at index as paid.
+        Args:
+            index (int): The index of the bill.
+        """
+        if not self.paid[index]:
+            self.paid[index] = 1
+            self.total_paid += self.amounts[index]
+
+    def totals(self):
+        """
+        Sum the stored bills.
+        Returns:
+            tuple: (total billed, total paid) as floats.
+        """
+        return self.total_billed, self.total_paid
+
+    def _recount(self):
+        # Used after bulk loads; compress() picks the paid amounts using the paid flags as a mask, all in C
+        self.total_billed = sum(self.amounts, 0.0)
+        self.total_paid = sum(compress(self.amounts, self.paid), 0.0)
+
+    def to_list_of_dicts(self):
+        """
+        Convert the stored bills to a list of dictionaries.
+        Returns:
+            list: One dictionary per bill, in the same format as Billing.to_dict().
+        """
+        return [
+            {'amount': amount, 'description': description, 'paid': bool(paid)}
+            for amount, description, paid in zip(self.amounts, self.descriptions, self.paid)
+        ]
+
+    def to_columns(self):
+        """
+        Convert the stored bills to one list per field.
+        Returns:
+            dict: Lists under 'amount', 'description' and 'paid', one entry per bill.
+        """
+        return {
+            'amount': self.amounts.tolist(),
+            'description': list(self.descriptions),
+            'paid': [bool(paid) for paid in self.paid],
+        }
+
+    @staticmethod
+    def from_columns(columns):
+        """
+        Create a BillingStore from the output of to_columns().
+        Args:
+            columns (dict): Lists under 'amount', 'description' and 'paid'.
+        Returns:
+            BillingStore: The filled store.
+        """
+        store = BillingStore()
+        store.amounts.extend(float(amount) for amount in columns['amount'])
+        store.descriptions.extend(columns['description'])
+        store.paid.extend(1 if paid else 0 for paid in columns['paid'])
+        store._recount()
+        return store
+
+    @staticmethod
+    def from_list_of_dicts(data):
+        """
+        Create a BillingStore from a list of bill dictionaries.
+        Args:
+            data (list): Dictionaries with keys 'amount', 'description', and optionally 'paid'.
+        Returns:
+            BillingStore: The filled store.
+        """
+        store = BillingStore()
+        store.amounts.extend(float(b['amount']) for b in data)
+        store.descriptions.extend(b['description'] for b in data)
+        store.paid.extend(1 if b.get('paid', False) else 0 for b in data)
+        store._recount()
+        return store
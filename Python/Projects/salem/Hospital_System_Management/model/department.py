@@ -1,3 +1,5 @@
+from .staff import Staff
+
 """
 Class representing a department in the hospital.
 Attributes:
@@ -6,12 +8,108 @@ Attributes:
     staff (list): List of staff members in the department.
 """
 class Department:
+    __slots__ = ('name', 'doctors', 'nurses', 'staff', 'patients', '_cached_dict', '_staff_by_name', '_doctors_by_name', '_doctor_set')
+
     def __init__(self, name):
         self.name = name
         self.doctors = []
         self.nurses = []
         self.staff = []
         self.patients = []
+        # Last to_dict() result, None when it has to be rebuilt
+        self._cached_dict = None
+        # Name lookups; the first member added under a name wins, like a list scan would
+        self._staff_by_name = {}
+        self._doctors_by_name = {}
+        # Membership test for assign_patient_to_doctor; people hash by identifier
+        self._doctor_set = set()
+
+    def mark_dirty(self):
+        """
+        Drop the cached to_dict() result.
+        Call this after changing the department's staff or patients directly.
+        """
+        self._cached_dict = None
+
+    def reindex_staff(self):
+        """
+        Rebuild the name lookups and the doctor set from the staff lists.
+        Call this after renaming, re-identifying or removing staff members directly.
+        """
+        self._staff_by_name = {}
+        for s in self.staff:
+            self._staff_by_name.setdefault(s.name, s)
+        self._doctors_by_name = {}
+        for d in self.doctors:
+            self._doctors_by_name.setdefault(d.name, d)
+        self._doctor_set = set(self.doctors)
+
+    def find_staff(self, name):
+        """
+        Args:
+            name (str): Name of the staff member.
+        Returns:
+            Staff: The first staff member with that name, or None.
+        """
+        return self._staff_by_name.get(name)
+
+    def find_doctor(self, name):
+        """
+        Args:
+            name (str): Name of the doctor.
+        Returns:
+            Doctor: The first doctor with that name, or None.
+        """
+        return self._doctors_by_name.get(name)
+
+    def remove_staff(self, staff_member):
+        """
+        Remove a staff member from the department, including the doctor and nurse lists.
+        Args:
+            staff_member: The staff member object to remove.
+        """
+        self.staff = [s for s in self.staff if s is not staff_member]
+        self.doctors = [d for d in self.doctors if d is not staff_member]
+        self.nurses = [n for n in self.nurses if n is not staff_member]
+        self.reindex_staff()
+        self.mark_dirty()
+
+    def to_dict(self):
+        """
+        Convert the Department object to a dictionary.
+        The result is cached until the department is marked dirty.
+        Returns:
+            dict: The department's patient names and staff records.
+        """
+        if self._cached_dict is None:
+            self._cached_dict = {
+                # getattr(p, 'name', str(p)) would format every patient just to build the unused default
+                'patients': [p.name if hasattr(p, 'name') else str(p) for p in self.patients],
+                'staff': [
+                    {'name': s.name, 'age': s.age, 'position': s.position, 'phone_number': s.phone_number, 'date_of_birth': s.date_of_birth, 'gender': s.gender, 'email': s.email, 'address': s.address, 'identifier': s.identifier }
+                    for s in self.staff
+                ]
+            }
+        return self._cached_dict
+
+    @staticmethod
+    def from_dict(name, data):
+        """
+        Create a Department object from a dictionary.
+        Args:
+            name (str): Name of the department.
+            data (dict): A dictionary with the department's 'staff' records.
+        Returns:
+            Department: A Department object created from the dictionary data.
+        """
+        department = Department(name)
+        # Append directly: add_staff() would announce every stored staff member again
+        department.staff = [
+            Staff(s['name'], s['age'], s['phone_number'], s['date_of_birth'], s['gender'], s['email'], s['address'], s['identifier'], s['position'])
+            for s in data.get('staff', [])
+        ]
+        department.reindex_staff()
+        return department
 
     def add_patient(self, patient):
         """
@@ -21,6 +119,7 @@ class Department:
         """
         self.patients.append(patient)
         print(f"Patient '{patient.name}' added to {self.name} department.")
+        self.mark_dirty()
 
     def add_staff(self, staff_member):
         """
@@ -29,22 +128,31 @@ class Department:
             staff_member: The staff member object to add.
         """
         self.staff.append(staff_member)
+        self._staff_by_name.setdefault(staff_member.name, staff_member)
         print(f"Staff '{staff_member.name}' added to {self.name} department.")
+        self.mark_dirty()
 
     def add_doctor(self, doctor):
         self.doctors.append(doctor)
         self.staff.append(doctor)
+        self._staff_by_name.setdefault(doctor.name, doctor)
+        self._doctors_by_name.setdefault(doctor.name, doctor)
+        self._doctor_set.add(doctor)
         print(f"Doctor '{doctor.name}' added to {self.name} department.")
+        self.mark_dirty()
 
     def add_nurse(self, nurse):
         self.nurses.append(nurse)
         self.staff.append(nurse)
+        self._staff_by_name.setdefault(nurse.name, nurse)
         print(f"Nurse '{nurse.name}' added to {self.name} department.")
+        self.mark_dirty()
 
     def assign_patient_to_doctor(self, patient, doctor):
-        if doctor in self.doctors:
+        if doctor in self._doctor_set:
             doctor.add_patient(patient)
             self.patients.append(patient)
             print(f"Patient '{patient.name}' assigned to Doctor '{doctor.name}' in {self.name} department.")
+            self.mark_dirty()
         else:
             print(f"Doctor '{doctor.name}' is not in {self.name} department.")
\ No newline at end of file
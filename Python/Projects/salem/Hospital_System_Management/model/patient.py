@@ -1,5 +1,25 @@
+import sys
+
 from .person import Person
-from .billing import Billing
+from .billing import BillingStore
+from .procedure import ProcedureStore
+
+
+def _intern(value):
+    # Status, relation and insurance provider repeat across many patients; share one string per value
+    return sys.intern(value) if type(value) is str else value
+
+
+def _next_of_kin(kin):
+    # Next of kin as a dict with all the required keys
+    if isinstance(kin, dict):
+        return {
+            'name': kin.get('name', ''),
+            'number': kin.get('number', ''),
+            'email': kin.get('email', ''),
+            'relation': _intern(kin.get('relation', ''))
+        }
+    return {'name': '', 'number': '', 'email': '', 'relation': ''}
 
 """
 Represents a patient in the hospital.
@@ -7,54 +27,63 @@ Attributes:
     name (str): The name of the patient.
     age (int): The age of the patient.
     condition (str): The medical condition of the patient.
-    patient_number (str/int): Unique identifier for the patient.
+    patient_number (int): Unique identifier for the patient (legacy non-numeric strings are kept as is).
     room_number (str/int, optional): The room number assigned to the patient.
-    procedures (list): List of procedures for the patient, each with a 'billed' flag.
-    billing (list): List of Billing objects associated with the patient.
+    procedures (ProcedureStore): Procedures of the patient with their billed flags, stored column-wise.
+    billing (BillingStore): Bills associated with the patient, stored column-wise.
     status (str): The current status of the patient.
     register_date (str, optional): The date of registration of the patient.
     discharge_date (str, optional): The date of discharge of the patient.
     date_of_death (str, optional): The date of death of the patient.
     insurance (dict): Insurance information for the patient.
+    coverage_fraction (float): Share of each bill covered by insurance, derived from insurance.
 """
 
 class Patient(Person):
+    __slots__ = ('condition', 'patient_number', 'patient_next_of_kin', 'room_number', 'procedures', 'billing', 'status',
+                 'register_date', 'discharge_date', 'date_of_death', '_insurance', 'coverage_fraction', '_cached_dict')
+
     def __init__(self, name, age, condition, patient_number, phone_number, date_of_birth, gender, email, address, identifier, patient_next_of_kin, room_number=None, procedures=None, billing=None, status='normal', register_date=None, discharge_date=None, date_of_death=None, insurance=None):
         super().__init__(name, age, phone_number, date_of_birth, gender, email, address, identifier)
         self.condition = condition
-        self.patient_number = patient_number
-        # Ensure next_of_kin is a dict with required keys
-        if isinstance(patient_next_of_kin, dict):
-            self.patient_next_of_kin = {
-                'name': patient_next_of_kin.get('name', ''),
-                'number': patient_next_of_kin.get('number', ''),
-                'email': patient_next_of_kin.get('email', ''),
-                'relation': patient_next_of_kin.get('relation', '')
-            }
-        else:
-            self.patient_next_of_kin = {'name': '', 'number': '', 'email': '', 'relation': ''}
+        self.patient_number = Patient.coerce_number(patient_number)
+        self.patient_next_of_kin = _next_of_kin(patient_next_of_kin)
         self.room_number = room_number
-        # Ensure all procedures have a 'billed' flag
-        if procedures is not None:
-            self.procedures = [
-                {**proc, 'billed': proc.get('billed', False)} for proc in procedures
-            ]
-        else:
-            self.procedures = []
-        self.billing = billing if billing is not None else []
-        self.status = status
+        self.procedures = procedures if isinstance(procedures, ProcedureStore) else ProcedureStore.from_list_of_dicts(procedures or ())
+        self.billing = billing if isinstance(billing, BillingStore) else BillingStore(billing)
+        self.status = _intern(status)
         self.register_date = register_date
         self.discharge_date = discharge_date
         self.date_of_death = date_of_death
         # Insurance info: dict with provider, policy_number, coverage_percent
-        if insurance is not None:
-            self.insurance = {
-                'provider': insurance.get('provider', ''),
-                'policy_number': insurance.get('policy_number', ''),
-                'coverage_percent': insurance.get('coverage_percent', 0)
-            }
-        else:
-            self.insurance = {'provider': '', 'policy_number': '', 'coverage_percent': 0}
+        self.insurance = insurance
+        # Last to_dict() result, None when it has to be rebuilt
+        self._cached_dict = None
+
+    @property
+    def insurance(self):
+        return self._insurance
+
+    @insurance.setter
+    def insurance(self, insurance):
+        # Always stored as a dict with all three keys, so callers can index it directly
+        if not isinstance(insurance, dict):
+            insurance = {}
+        self._insurance = {
+            'provider': _intern(insurance.get('provider', '')),
+            'policy_number': insurance.get('policy_number', ''),
+            'coverage_percent': insurance.get('coverage_percent', 0)
+        }
+        # Share of each bill covered by insurance, worked out once instead of per bill
+        coverage = self._insurance['coverage_percent']
+        self.coverage_fraction = coverage / 100 if coverage > 0 else 0.0
+
+    def mark_dirty(self):
+        """
+        Drop the cached to_dict() result.
+        Call this after changing the patient's attributes or bills directly.
+        """
+        self._cached_dict = None
 
     def add_bill(self, bill):
         """
@@ -63,6 +92,7 @@ class Patient(Person):
             bill (Billing): The billing record to add.
         """
         self.billing.append(bill)
+        self.mark_dirty()
 
     def add_procedure(self, date, description):
         """
@@ -71,7 +101,8 @@ class Patient(Person):
             date (str): The date of the procedure.
             description (str): Description of the procedure.
         """
-        self.procedures.append({'date': date, 'description': description, 'billed': False})
+        self.procedures.append(date, description)
+        self.mark_dirty()
 
     def mark_procedure_billed(self, index):
         """
@@ -80,15 +111,16 @@ class Patient(Person):
             index (int): The index of the procedure to mark as billed.
         """
         if 0 <= index < len(self.procedures):
-            self.procedures[index]['billed'] = True
+            self.procedures.mark_billed(index)
+            self.mark_dirty()
 
     def view_procedures(self):
         """
         View all procedures for the patient.
         Returns:
-            list: List of procedures.
+            list: List of procedures, as dicts with 'date', 'description' and 'billed'.
         """
-        return self.procedures
+        return list(self.procedures)
 
     def update_status(self, new_status):
         """
@@ -96,15 +128,19 @@ class Patient(Person):
         Args:
             new_status (str): The new status to set.
         """
-        self.status = new_status
+        self.status = _intern(new_status)
+        self.mark_dirty()
 
     def to_dict(self):
         """
         Convert the Patient object to a dictionary.
+        The result is cached until the patient is marked dirty.
         Returns:
             dict: A dictionary representation of the patient.
         """
-        return {
+        if self._cached_dict is not None:
+            return self._cached_dict
+        self._cached_dict = {
             'name': self.name,
             'age': self.age,
             'condition': self.condition,
@@ -117,14 +153,30 @@ class Patient(Person):
             'email': self.email,
             'address': self.address,
             'identifier': self.identifier,
-            'procedures': self.procedures,
-            'billing': [b.to_dict() for b in self.billing],
+            # Procedures and bills are stored one list per field, so the keys appear once per patient
+            'procedures_cols': self.procedures.to_columns(),
+            'billing_cols': self.billing.to_columns(),
             'status': self.status,
             'register_date': self.register_date,
             'discharge_date': self.discharge_date,
             'date_of_death': self.date_of_death,
             'insurance': self.insurance,
         }
+        return self._cached_dict
+
+    @staticmethod
+    def coerce_number(patient_number):
+        """
+        Normalize a patient number to an int, so '1001' and 1001 compare equal.
+        Args:
+            patient_number (str/int): The patient number as stored or entered.
+        Returns:
+            int: The patient number, or the original value if it is not numeric.
+        """
+        try:
+            return int(patient_number)
+        except (TypeError, ValueError):
+            return patient_number
 
     @staticmethod
     def from_dict(data):
@@ -135,25 +187,36 @@ class Patient(Person):
         Returns:
             Patient: A Patient object created from the dictionary data.
         """
-        billing = [Billing.from_dict(b) for b in data.get('billing', [])]
-        return Patient(
-            data['name'],
-            data['age'],
-            data['condition'],
-            data['patient_number'],
-            data['phone_number'],
-            data['date_of_birth'],
-            data['gender'],
-            data['email'],
-            data['address'],
-            data['identifier'],
-            data.get('patient_next_of_kin', {'name': '', 'number': '', 'email': '', 'relation': ''}),
-            room_number=data.get('room_number'),
-            procedures=data.get('procedures', []),
-            billing=billing,
-            status=data.get('status', 'normal'),
-            register_date=data.get('register_date'),
-            discharge_date=data.get('discharge_date'),
-            date_of_death=data.get('date_of_death'),
-            insurance=data.get('insurance', {'provider': '', 'policy_number': '', 'coverage_percent': 0})
-        )
\ No newline at end of file
+        # Older files store procedures and bills as one dictionary per row
+        if 'procedures_cols' in data:
+            procedures = ProcedureStore.from_columns(data['procedures_cols'])
+        else:
+            procedures = ProcedureStore.from_list_of_dicts(data.get('procedures', []))
+        if 'billing_cols' in data:
+            billing = BillingStore.from_columns(data['billing_cols'])
+        else:
+            billing = BillingStore.from_list_of_dicts(data.get('billing', []))
+        # Same result as Patient(...), with the fields assigned directly: loading skips
+        # the argument binding and the Person.__init__ call for every stored patient
+        patient = Patient.__new__(Patient)
+        patient.name = data['name']
+        patient.age = data['age']
+        patient.phone_number = data['phone_number']
+        patient.date_of_birth = data['date_of_birth']
+        patient.gender = _intern(data['gender'])
+        patient.email = data['email']
+        patient.address = data['address']
+        patient.identifier = data['identifier']
+        patient.condition = data['condition']
+        patient.patient_number = Patient.coerce_number(data['patient_number'])
+        patient.patient_next_of_kin = _next_of_kin(data.get('patient_next_of_kin'))
+        patient.room_number = data.get('room_number')
+        patient.procedures = procedures
+        patient.billing = billing
+        patient.status = _intern(data.get('status', 'normal'))
+        patient.register_date = data.get('register_date')
+        patient.discharge_date = data.get('discharge_date')
+        patient.date_of_death = data.get('date_of_death')
+        patient.insurance = data.get('insurance')
+        patient._cached_dict = None
+        return patient
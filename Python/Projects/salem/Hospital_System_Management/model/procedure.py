@@ -0,0 +1,110 @@
+class ProcedureStore:
+    """
+    Column-oriented collection of a patient's procedures.
+    Procedures are kept as parallel lists instead of one dict each, with the
+    billed flags packed one byte per procedure.
+    Attributes:
+        dates (list): Procedure dates.
+        descriptions (list): Procedure descriptions.
+        billed (bytearray): 1 for each billed procedure, 0 otherwise.
+    """
+    __slots__ = ('dates', 'descriptions', 'billed')
+
+    def __init__(self):
+        self.dates = []
+        self.descriptions = []
+        self.billed = bytearray()
+
+    def __len__(self):
+        return len(self.descriptions)
+
+    def __getitem__(self, index):
+        """
+        Get a procedure by index.
+        Args:
+            index (int): The index of the procedure.
+        Returns:
+            dict: A copy of the procedure with 'date', 'description' and 'billed';
+                use mark_billed() to change the stored procedure.
+        """
+        return {'date': self.dates[index], 'description': self.descriptions[index], 'billed': bool(self.billed[index])}
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, date, description, billed=False):
+        """
+        Add a procedure to the store.
+        Args:
+            date (str): The date of the procedure.
+            description (str): Description of the procedure.
+            billed (bool): Whether the procedure has been billed.
+        """
+        self.dates.append(date)
+        self.descriptions.append(description)
+        self.billed.append(1 if billed else 0)
+
+    def mark_billed(self, index):
+        """
+        Mark the procedure at index as billed.
+        Args:
+            index (int): The index of the procedure.
+        """
+        self.billed[index] = 1
+
+    def unbilled(self):
+        """
+        Returns:
+            list: Indexes of the procedures not billed yet, in order.
+        """
+        billed = self.billed
+        indexes = []
+        # find() scans the flag bytes in C and jumps straight to the next unbilled one
+        index = billed.find(0)
+        while index != -1:
+            indexes.append(index)
+            index = billed.find(0, index + 1)
+        return indexes
+
+    def to_columns(self):
+        """
+        Convert the stored procedures to one list per field.
+        Returns:
+            dict: Lists under 'date', 'description' and 'billed', one entry per procedure.
+        """
+        return {
+            'date': list(self.dates),
+            'description': list(self.descriptions),
+            'billed': [bool(billed) for billed in self.billed],
+        }
+
+    @staticmethod
+    def from_columns(columns):
+        """
+        Create a ProcedureStore from the output of to_columns().
+        Args:
+            columns (dict): Lists under 'date', 'description' and 'billed'.
+        Returns:
+            ProcedureStore: The filled store.
+        """
+        store = ProcedureStore()
+        store.dates.extend(columns['date'])
+        store.descriptions.extend(columns['description'])
+        store.billed.extend(1 if billed else 0 for billed in columns['billed'])
+        return store
+
+    @staticmethod
+    def from_list_of_dicts(data):
+        """
+        Create a ProcedureStore from a list of procedure dictionaries.
+        Args:
+            data (list): Dictionaries with keys 'date', 'description', and optionally 'billed'.
+        Returns:
+            ProcedureStore: The filled store.
+        """
+        store = ProcedureStore()
+        store.dates.extend(p.get('date') for p in data)
+        store.descriptions.extend(p.get('description') for p in data)
+        store.billed.extend(1 if p.get('billed', False) else 0 for p in data)
+        return store
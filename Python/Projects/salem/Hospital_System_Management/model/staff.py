@@ -1,3 +1,6 @@
+import sys
+from weakref import WeakValueDictionary
+
 from .person import Person
 
 """
@@ -6,12 +9,28 @@ Attributes:
     name (str): The name of the staff member.
     age (int): The age of the staff member.
     position (str): The position/job title of the staff member.
+    position_lc (str): Lowercased position, kept in step with position for role checks.
 """
 class Staff(Person):
+    __slots__ = ('_position', 'position_lc')
+
     def __init__(self, name, age, phone_number, date_of_birth, gender, email, address, identifier, position):
         super().__init__(name, age, phone_number, date_of_birth, gender, email, address, identifier)
         self.position = position
 
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, position):
+        if type(position) is str:
+            self._position = sys.intern(position)
+            self.position_lc = sys.intern(position.lower())
+        else:
+            self._position = position
+            self.position_lc = position
+
     def view_info(self):
         """
         View staff information.
@@ -21,19 +40,57 @@ class Staff(Person):
         return f"Staff Name: {self.name}, Age: {self.age}, Position: {self.position}, Phone Number: {self.phone_number}, Date of Birth: {self.date_of_birth}, Gender: {self.gender}, Email: {self.email}, Address: {self.address}, Identifier: {self.identifier}"
 
 class Doctor(Staff):
+    __slots__ = ('specialty', 'patients')
+
     def __init__(self, name, age, phone_number, date_of_birth, gender, email, address, identifier, specialty):
-        super().__init__(name, age, phone_number, date_of_birth, gender, email, address, identifier, position='Doctor')
+        # Skip the Staff.__init__ frame: it only forwards to Person and sets position
+        Person.__init__(self, name, age, phone_number, date_of_birth, gender, email, address, identifier)
+        self.position = 'Doctor'
         self.specialty = specialty
-        self.patients = []
+        # id(patient) -> patient, in assignment order; patients dropped elsewhere fall out on their own
+        self.patients = WeakValueDictionary()
+
+    def add_patient(self, patient, announce=False):
+        """
+        Assign a patient to the doctor.
+        Args:
+            patient (Patient): The patient to assign.
+            announce (bool): Print a confirmation. Off by default, since
+                Department.assign_patient_to_doctor already reports the assignment.
+        """
+        self.patients[id(patient)] = patient
+        if announce:
+            print(f"Patient '{patient.name}' assigned to Doctor {self.name}.")
+
+    def add_patients(self, patients):
+        """
+        Assign several patients to the doctor at once, without printing.
+        Args:
+            patients (iterable): The patients to assign.
+        """
+        self.patients.update((id(patient), patient) for patient in patients)
 
-    def add_patient(self, patient):
-        self.patients.append(patient)
-        print(f"Patient '{patient.name}' assigned to Doctor {self.name}.")
+    def has_patient(self, patient):
+        """
+        Check whether a patient is assigned to the doctor, in constant time.
+        Args:
+            patient (Patient): The patient to look for.
+        Returns:
+            bool: True if the patient is assigned to this doctor.
+        """
+        return self.patients.get(id(patient)) is patient
 
     def view_patients(self):
-        return self.patients
+        """
+        Returns:
+            list: The doctor's patients that are still alive in memory, in assignment order.
+        """
+        return list(self.patients.values())
 
 class Nurse(Staff):
+    __slots__ = ('department',)
+
     def __init__(self, name, age, phone_number, date_of_birth, gender, email, address, identifier, department=None):
-        super().__init__(name, age, phone_number, date_of_birth, gender, email, address, identifier, position='Nurse')
+        Person.__init__(self, name, age, phone_number, date_of_birth, gender, email, address, identifier)
+        self.position = 'Nurse'
         self.department = department
\ No newline at end of file
@@ -0,0 +1,18 @@
+"""
+Optional build step: compile the Person/Staff models with Cython.
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+The compiled modules are picked up in place of model/person.py and
+model/staff.py; without this step the plain Python files are used.
+Re-run the build after editing either file, or delete the compiled
+modules, otherwise the stale build keeps being imported.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="hospital-system-models",
+    ext_modules=cythonize(["model/person.py", "model/staff.py"], language_level=3),
+)
@@ -0,0 +1,57 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.hospital_system import HospitalSystem
+from model.staff import Doctor
+
+
+class AddStaffCsvTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        with redirect_stdout(io.StringIO()):
+            self.system = HospitalSystem(os.path.join(self.tmp.name, "hospital.json"))
+        # Runs before the temporary directory is removed (cleanups run last-in, first-out)
+        self.addCleanup(self.close_system)
+
+    def close_system(self):
+        with redirect_stdout(io.StringIO()):
+            self.system.close()
+
+    def run_menu(self, *answers):
+        """Drive the main menu with the given answers, then exit without saving."""
+        out = io.StringIO()
+        with mock.patch('builtins.input', side_effect=answers + ('20', 'n')), redirect_stdout(out):
+            self.system.main_menu()
+        return out.getvalue()
+
+    def test_csv_line_with_spaces_after_commas_creates_doctor(self):
+        self.run_menu('23', 'Cardio, Zed, 33, doctor, 555, 1990-01-01, M, zed@example.com, "1 Main St, Town", D7, Heart')
+        dept = self.system.departments['Cardio']
+        doctor = dept.find_doctor('Zed')
+        self.assertIsInstance(doctor, Doctor)
+        self.assertEqual(doctor.age, 33)
+        self.assertEqual(doctor.address, '1 Main St, Town')
+        self.assertEqual(doctor.identifier, 'D7')
+        self.assertEqual(doctor.specialty, 'Heart')
+
+    def test_csv_line_with_bad_age_is_rejected_and_menu_continues(self):
+        output = self.run_menu('23', 'Cardio, Zed, old, doctor, 555, 1990-01-01, M, zed@example.com, Street, D7')
+        self.assertIn("Invalid age 'old'.", output)
+        self.assertIn("Goodbye!", output)
+        self.assertNotIn('Cardio', self.system.departments)
+
+    def test_option_9_asks_for_department_name_first(self):
+        self.run_menu('9', 'Surgery, General', 'Amy', '40', 'Nurse', '555', '1985-02-02', 'F', 'amy@example.com', 'Street', 'N1', '')
+        self.assertIn('Surgery, General', self.system.departments)
+        self.assertIsNotNone(self.system.departments['Surgery, General'].find_staff('Amy'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.hospital_system import HospitalSystem
+
+
+class JournalReplayAfterCrashTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def open_system(self, name):
+        with redirect_stdout(io.StringIO()):
+            system = HospitalSystem(os.path.join(self.tmp.name, name))
+        self.addCleanup(self.close_system, system)
+        return system
+
+    def close_system(self, system):
+        with redirect_stdout(io.StringIO()):
+            system.close()
+
+    def crash_after_save(self, name):
+        """
+        Add a patient with one bill, one procedure and a paid bill, then save with the
+        journal removal failing, as if the process died right after the database file was written.
+        """
+        system = self.open_system(name)
+        with redirect_stdout(io.StringIO()):
+            patient = system.add_patient("Ann", 30, "Flu", "555", "1995-01-01", "F", "ann@example.com",
+                                         "1 Main St", "ID1", {})
+            system.save_data()
+            system.generate_bill(patient, 100.0, "x")
+            with mock.patch('builtins.input', side_effect=["0", "2024-01-01", "X-ray"]):
+                system.mark_bill_paid(patient)
+                system.add_procedure_to_patient(patient)
+            with mock.patch('core.hospital_system.os.remove', side_effect=OSError("crash")):
+                with self.assertRaises(OSError):
+                    system.save_data()
+        self.assertTrue(os.path.exists(system.journal_file))
+
+    def assert_replayed_once(self, name):
+        reopened = self.open_system(name)
+        patient = reopened.find_patient("Ann")
+        self.assertEqual(len(patient.billing), 1)
+        self.assertEqual(patient.billing.totals(), (100.0, 100.0))
+        self.assertEqual(len(patient.procedures), 1)
+
+    def test_json_file_does_not_replay_saved_records(self):
+        self.crash_after_save("hospital.json")
+        self.assert_replayed_once("hospital.json")
+
+    def test_sqlite_file_does_not_replay_saved_records(self):
+        self.crash_after_save("hospital.db")
+        self.assert_replayed_once("hospital.db")
+
+
+if __name__ == '__main__':
+    unittest.main()
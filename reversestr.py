@@ -18,13 +18,12 @@ class ReverseStr2:
         
         Algorithm:
         1. Split string into list of words
-        2. Reverse the list using slice notation
+        2. Reverse the list in place (no second list, unlike slicing)
         3. Join words back together with spaces
         
         Returns:
             str: A new string with the words in reverse order
         """
         lst = self.string.split(" ")
-        new_lst = lst[::-1]
-        new_str = " ".join(new_lst)
-        return new_str
\ No newline at end of file
+        lst.reverse()
+        return " ".join(lst)
\ No newline at end of file
@@ -5,6 +5,10 @@ class SystemManager:
     def __init__(self):
         self.students = {}
         self.courses = {}
+        # Lowercased course name -> courses with that name
+        self._courses_by_lname = {}
+        # Student ID -> IDs of the courses the student is enrolled in
+        self._student_courses = {}
 
     def add_student(self, name):
         student = Student(name)
@@ -26,6 +30,7 @@ class SystemManager:
     def add_course(self, name):
         course = Course(name)
         self.courses[course.course_id] = course
+        self._courses_by_lname.setdefault(name.lower(), []).append(course)
         print("Course added successfully.")
         return course.course_id
     
@@ -34,6 +39,11 @@ class SystemManager:
             course = self.courses[course_id]
             if not course.enrolled_students:
                 del self.courses[course_id]
+                lname = course.name.lower()
+                same_name = self._courses_by_lname[lname]
+                same_name.remove(course)
+                if not same_name:
+                    del self._courses_by_lname[lname]
                 print("Course removed successfully")
             else:
                 print("Course has enrolled student. Cannot remove.")
@@ -48,18 +58,26 @@ class SystemManager:
             if course.name not in  student.enrolled_courses:
                 student.enroll_in_course(course.name)
                 course.enroll_student(student.name)
+                self._student_courses.setdefault(student_id, set()).add(course_id)
                 print("Student enrolled in ccourse successfully.")
             else:
                 print("Student is already enrolled in the course")
         else:
             print("Invalid student or course ID.")
 
+    def unenroll_student(self, student_id):
+        if student_id in self.students:
+            student = self.students[student_id]
+            for course_id in self._student_courses.pop(student_id, ()):
+                course = self.courses[course_id]
+                course.remove_student(student.name)
+                student.enrolled_courses.discard(course.name)
+            print("Student unenrolled from all courses.")
+        else:
+            print("Invalid student ID.")
+
     def search_courses(self, serach_name):
-        result = []
-        for course in self.courses.values():
-            if serach_name.lower() == course.name.lower():
-                result.append(course.name)
-        return result
+        return [course.name for course in self._courses_by_lname.get(serach_name.lower(), ())]
     
     def record_grade(self, student_id, course_id, grade):
         if student_id in self.students and course_id in self.courses:
@@ -1,25 +1,24 @@
 class Course:
+    __slots__ = ('course_id', 'name', 'enrolled_students')
     _id_counter = 1
     def __init__(self, name):
         self.course_id = Course._id_counter
         Course._id_counter += 1
         self.name = name
-        self.enrolled_students = []
+        self.enrolled_students = set()
 
     def __str__(self):
         return f"Course ID: {self.course_id}, Name: {self.name}, Enrolled: {len(self.enrolled_students)}"
     
     def enroll_student(self, student):
         if student not in self.enrolled_students:
-            self.enrolled_students.append(student)
+            self.enrolled_students.add(student)
             print("Student enrolled Successfully.")
         else:
             print("Student already enrolled")
-    
+
     def remove_student(self, student):
-        for course in self.courses.values():
-            if student in course.enrolled_students:
-                course.enrolled_students.remove(student)
+        self.enrolled_students.discard(student)
 
 
 
@@ -1,4 +1,5 @@
 class Student:
+    __slots__ = ('student_id', 'name', 'grades', 'enrolled_courses')
     _id_counter = 1
 
     def __init__(self, name):
@@ -6,7 +7,7 @@ class Student:
         Student._id_counter += 1
         self.name = name
         self.grades = {}
-        self.enrolled_courses = []
+        self.enrolled_courses = set()
 
     def __str__(self):
         return f"Student ID: {self.student_id}, Name: {self.name}, Grades: {(self.grades)}"
@@ -15,4 +16,4 @@ class Student:
         self.grades[course_id] = grade
 
     def enroll_in_course(self, course):
-        self.enrolled_courses.append(course)
+        self.enrolled_courses.add(course)